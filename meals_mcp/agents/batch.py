@@ -0,0 +1,133 @@
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date as Date, timedelta
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from meals_mcp.agents.core import Plan
+
+# Planner <-> Coach iterations per week before the last plan is kept as is
+MAX_AGENT_RETRIES = 3
+
+class WeekPlan(BaseModel):
+    start_date: str
+    end_date: str
+    meals: List[Plan] = Field(default_factory=list)
+    shopping_list: Dict[str, Any] = Field(default_factory=dict)
+    evaluation: Dict[str, Any] = Field(default_factory=dict)
+    tips: Optional[str] = None
+
+def week_ranges(start_date: str, weeks: int) -> List[tuple]:
+    """
+    Returns the (start, end) ISO dates of `weeks` consecutive weeks.
+    """
+    start = Date.fromisoformat(start_date)
+    return [
+        ((start + timedelta(days=7 * k)).isoformat(), (start + timedelta(days=7 * k + 6)).isoformat())
+        for k in range(weeks)
+    ]
+
+class BatchPlanner:
+    """
+    Plans several weeks in a row without interaction.
+
+    The agents run as a pipeline, each on its own thread: while the Coach
+    evaluates week k and the Cooker writes its recipe cards, the Planner
+    already drafts week k+1. Every week is planned with the plans of the
+    previous weeks in its history (the latest version known at the time),
+    so meals rotate across weeks.
+
+    Rejected weeks are revised by `reviser`, a second Planner used by the
+    Coach stage (agent chats are not shared between threads), so revisions
+    never hold up the drafts of the next weeks.
+    """
+
+    def __init__(self, planner, coach, cooker, reviser, max_retries: int = MAX_AGENT_RETRIES, log=print):
+        self.planner = planner
+        self.coach = coach
+        self.cooker = cooker
+        self.reviser = reviser
+        self.max_retries = max_retries
+        self.log = log
+        self._lock = threading.Lock()
+
+    def _draft(self, agent, week: WeekPlan, planned: List[Plan], feedback: Optional[str] = None) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            plans, shopping_list = agent.create_plan(week.start_date, week.end_date, feedback, planned=planned)
+            if plans:
+                with self._lock:
+                    week.meals, week.shopping_list = plans, shopping_list
+                return
+            self.log(f"❌ Planner failed to generate a valid plan for {week.start_date} (attempt {attempt}).")
+        raise RuntimeError(f"Planner failed to generate a plan for the week of {week.start_date}.")
+
+    def _planned_before(self, weeks: List[WeekPlan], index: int) -> List[Plan]:
+        with self._lock:
+            return [plan for week in weeks[:index] for plan in week.meals]
+
+    def _review(self, weeks: List[WeekPlan], index: int) -> WeekPlan:
+        week = weeks[index]
+        for attempt in range(1, self.max_retries + 1):
+            evaluation = self.coach.evaluate_plan(week.meals)
+            self.log(f"🥗 Week of {week.start_date}: Coach status {evaluation.get('status')} (iteration {attempt})")
+            week.evaluation = evaluation
+            if evaluation.get("status") == "APPROVED" or attempt == self.max_retries:
+                return week
+            self._draft(self.reviser, week, self._planned_before(weeks, index), evaluation.get("critique"))
+        return week
+
+    def _card(self, review: Future) -> WeekPlan:
+        week = review.result()
+        # The Cooker reuses the cards stored on the meals the Planner read
+        week.tips = self.cooker.get_tips(week.meals, meals=getattr(self.planner, "recent_meals", None))
+        self.log(f"👨‍🍳 Week of {week.start_date}: recipe cards ready")
+        return week
+
+    def plan(self, start_date: str, weeks: int) -> List[WeekPlan]:
+        """
+        Plans `weeks` weeks from `start_date` and returns them in order.
+        """
+        plans = [WeekPlan(start_date=start, end_date=end) for start, end in week_ranges(start_date, weeks)]
+        cards = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="coach") as coach_stage, \
+             ThreadPoolExecutor(max_workers=1, thread_name_prefix="cooker") as cooker_stage:
+            for index, week in enumerate(plans):
+                self.log(f"🤖 Planning the week of {week.start_date}...")
+                self._draft(self.planner, week, self._planned_before(plans, index))
+                review = coach_stage.submit(self._review, plans, index)
+                cards.append(cooker_stage.submit(self._card, review))
+            return [card.result() for card in cards]
+
+def to_json(weeks: List[WeekPlan]) -> str:
+    return json.dumps({"weeks": [week.model_dump() for week in weeks]}, indent=2, ensure_ascii=False)
+
+def to_markdown(weeks: List[WeekPlan]) -> str:
+    lines = [f"# Meal plan from {weeks[0].start_date} to {weeks[-1].end_date}" if weeks else "# Meal plan"]
+    for number, week in enumerate(weeks, 1):
+        lines += ["", f"## Week {number}: {week.start_date} to {week.end_date}", ""]
+        if week.evaluation:
+            lines += [f"Coach: **{week.evaluation.get('status')}**: {week.evaluation.get('critique', 'No feedback.')}", ""]
+        lines += ["| Date | Midi | Soir |", "| --- | --- | --- |"]
+        for plan in week.meals:
+            lines.append(f"| {plan.date} | {plan.midi or ''} | {plan.soir or ''} |")
+        if week.shopping_list:
+            lines += ["", "### Shopping list"]
+            for category, items in week.shopping_list.items():
+                lines += ["", f"**{category}**"]
+                for item in items:
+                    lines.append(f"- {item['item']} ({item['quantity']})" if isinstance(item, dict) else f"- {item}")
+        if week.tips:
+            lines += ["", "### Recipe cards", "", week.tips.strip()]
+    return "\n".join(lines) + "\n"
+
+def write_weeks(weeks: List[WeekPlan], path: str, output_format: Optional[str] = None) -> None:
+    """
+    Writes the planned weeks to `path` as JSON or Markdown (guessed from the
+    extension unless given).
+    """
+    if output_format is None:
+        output_format = "json" if path.endswith(".json") else "markdown"
+    content = to_json(weeks) if output_format == "json" else to_markdown(weeks)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
@@ -2,12 +2,13 @@ import json
 import os
 from typing import List, Dict, Optional, Any
 from pydantic import BaseModel
-from google import genai
-from google.genai import types
-from google.genai.chats import Chat
 
-from meals_mcp.agents.prompts import PLANNER_INSTRUCTION, DIETICAL_COACH_INSTRUCTION, COOKER_INSTRUCTION
+from meals_mcp.agents.prompts import PLANNER_INSTRUCTION, DIETICAL_COACH_INSTRUCTION, COOKER_INSTRUCTION, COOKER_PROMPT
+from meals_mcp.models import Meal
+from meals_mcp.utils.cards import CARD_CACHE_ENV, DEFAULT_CARD_CACHE, RecipeCardCache, card_version, recipe_cards
 from meals_mcp.utils.notion import NotionClient
+from meals_mcp.utils.snapshot import SNAPSHOT_ENV, SnapshotClient
+from meals_mcp.utils.sources import SOURCES_ENV, MultiSourceClient
 
 class Plan(BaseModel):
     date: str
@@ -22,6 +23,10 @@ class Agent:
         api_key = os.environ.get("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is not set.")
+        # google.genai is slow to import: only load it when an agent is created
+        from google import genai
+        from google.genai import types
+
         self.client = genai.Client(api_key=api_key)
         self.model_name = model_name
         self.system_instruction = system_instruction
@@ -40,11 +45,21 @@ class Agent:
 class PlannerAgent(Agent):
     def __init__(self):
         super().__init__(system_instruction=PLANNER_INSTRUCTION)
-        self.notion_client = NotionClient()
+        snapshot_path = os.environ.get(SNAPSHOT_ENV)
+        # Read the history from a local snapshot or from several sources when configured
+        if snapshot_path:
+            self.notion_client = SnapshotClient(snapshot_path)
+        elif os.environ.get(SOURCES_ENV):
+            self.notion_client = MultiSourceClient.from_env(NotionClient)
+        else:
+            self.notion_client = NotionClient()
+        self.recent_meals: List[Meal] = []
 
     def get_recent_meals_context(self, limit: int = 90) -> str:
         try:
             meals = self.notion_client.get_meals(limit=limit)
+            # Kept for the Cooker, which reuses the cards stored on these pages
+            self.recent_meals = meals
             context = "Here are the meals from the last 3 months (90 days approx):\n"
             for meal in meals:
                 context += f"- {meal.name} ({meal.date}, {meal.heure})\n"
@@ -52,8 +67,14 @@ class PlannerAgent(Agent):
         except Exception as e:
             return f"Error fetching recent meals: {e}"
 
-    def create_plan(self, start_date: str, end_date: str, feedback: Optional[str] = None) -> tuple[List[Plan], Dict[str, Any]]:
+    def create_plan(self, start_date: str, end_date: str, feedback: Optional[str] = None, planned: Optional[List[Plan]] = None) -> tuple[List[Plan], Dict[str, Any]]:
         context = self.get_recent_meals_context()
+        if planned:
+            # Meals planned for the previous weeks are not in Notion yet
+            context += "\nMeals already planned for the previous weeks (rotate, do not repeat them):\n"
+            for plan in planned:
+                midi_str = f"Midi: {plan.midi} | " if plan.midi else ""
+                context += f"- {plan.date}: {midi_str}Soir: {plan.soir}\n"
         prompt = f"""
         Context: {context}
 
@@ -112,15 +133,31 @@ class DieticalCoachAgent(Agent):
 
 
 class CookerAgent(Agent):
-    def __init__(self):
+    def __init__(self, card_cache: Optional[RecipeCardCache] = None):
         super().__init__(system_instruction=COOKER_INSTRUCTION)
+        if card_cache is None:
+            path = os.environ.get(CARD_CACHE_ENV) or DEFAULT_CARD_CACHE
+            card_cache = RecipeCardCache(path, card_version(self.model_name, COOKER_INSTRUCTION, COOKER_PROMPT))
+        self.card_cache = card_cache
 
-    def get_tips(self, plans: List[Plan]) -> str:
-        plan_str = json.dumps([p.model_dump() for p in plans], indent=2)
-        prompt = f"""
-        Here is the final approved meal plan:
-        {plan_str}
+    def generate_cards(self, names: List[str]) -> Dict[str, str]:
+        prompt = COOKER_PROMPT.format(meals=json.dumps(names, ensure_ascii=False, indent=2))
+        response_text = self.send_message(prompt)
+        try:
+            cleaned_response = response_text.replace("```json", "").replace("```", "").strip()
+            cards = json.loads(cleaned_response)
+            return {name: card for name, card in cards.items() if isinstance(card, str)}
+        except (json.JSONDecodeError, AttributeError):
+            print(f"Error parsing JSON from Cooker: {response_text}")
+            return {}
 
-        Please provide your Recipe Cards in French!
+    def get_tips(self, plans: List[Plan], meals: Optional[List[Meal]] = None, notion_client=None) -> str:
+        """
+        Returns the recipe cards of the plan in day order, only generating the
+        cards of meals missing from the cache (or from the `meals` pages).
+        With a `notion_client`, new cards are stored on the matching `meals` pages.
         """
-        return self.send_message(prompt)
+        store = None
+        if notion_client is not None:
+            store = lambda meal_id, card: notion_client.update_meal(meal_id=meal_id, updates={"card": card})
+        return recipe_cards(plans, self.card_cache, self.generate_cards, meals=meals, store=store)
@@ -1,4 +1,8 @@
+import argparse
 import os
+import time
+from datetime import date
+from typing import List
 from meals_mcp.utils.notion import NotionClient
 
 def main():
@@ -19,5 +23,49 @@ def main():
     except Exception as e:
         print(f"Error interacting with Notion API: {e}")
 
+def snapshot(output: str = None, info: str = None):
+    """
+    Exports the full meal history to a snapshot file, or describes an existing one.
+    """
+    from meals_mcp.utils.snapshot import MealSnapshot, write_snapshot
+
+    try:
+        if info:
+            start = time.perf_counter()
+            meal_snapshot = MealSnapshot(info)
+            elapsed = time.perf_counter() - start
+            ordinals = meal_snapshot.ordinals
+            print(f"Snapshot {info}: {len(meal_snapshot)} meals, {os.path.getsize(info)} bytes (opened in {elapsed * 1000:.1f} ms)")
+            if len(meal_snapshot):
+                print(f"- Dates: {date.fromordinal(min(ordinals))} to {date.fromordinal(max(ordinals))}")
+            print(f"- Distinct names: {len(meal_snapshot.names)}")
+            print(f"- Distinct ingredients: {len(meal_snapshot.ingredients)}")
+            meal_snapshot.close()
+            return
+
+        meals = NotionClient().get_all_meals()
+        size = write_snapshot(meals, output)
+        print(f"Saved {len(meals)} meals to {output} ({size} bytes).")
+    except ValueError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print(f"Error creating snapshot: {e}")
+
+def cli(argv: List[str] = None):
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(prog="meals-mcp", description="Meals MCP command line tools.")
+    subparsers = parser.add_subparsers(dest="command")
+    snapshot_parser = subparsers.add_parser("snapshot", help="Export the meal history to a memory-mappable snapshot file.")
+    snapshot_parser.add_argument("output", nargs="?", default="meals.snapshot", help="Snapshot file to write (default: meals.snapshot).")
+    snapshot_parser.add_argument("--info", metavar="PATH", help="Describe an existing snapshot file instead of exporting.")
+    args = parser.parse_args(argv)
+
+    if args.command == "snapshot":
+        snapshot(args.output, args.info)
+    else:
+        main()
+
 if __name__ == "__main__":
-    main()
+    cli()
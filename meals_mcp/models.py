@@ -1,5 +1,7 @@
+from datetime import date as Date
 from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, model_validator
+from meals_mcp.utils.dates import parse_date
 
 class Meal(BaseModel):
     id: Optional[str] = Field(None, description="The Notion ID of the meal page")
@@ -8,5 +10,44 @@ class Meal(BaseModel):
     ingredients: List[str] = Field(default_factory=list, description="List of ingredients associated with the meal")
     heure: str = Field(..., description="Whether the meal is for 'midi' (noon) or 'soir' (evening)")
     recipe: Optional[str] = Field(None, description="Link to the recipe")
+    source: Optional[str] = Field(None, description="The meal source (database) the meal comes from, when several are configured")
+    card: Optional[str] = Field(None, description="The recipe card generated for the meal, if stored on its page")
+    last_edited_time: Optional[str] = Field(None, description="When the meal page was last edited in Notion (ISO 8601)")
 
     model_config = ConfigDict(populate_by_name=True)
+
+    # The date parsed once per meal, kept in sync with `date`
+    _ordinal: int = PrivateAttr(0)
+    _timestamp: float = PrivateAttr(0.0)
+
+    @model_validator(mode="after")
+    def _parse_date(self) -> "Meal":
+        self._ordinal, self._timestamp = parse_date(self.date)
+        return self
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "date":
+            self._parse_date()
+
+    def model_copy(self, *, update=None, deep: bool = False) -> "Meal":
+        # Copies skip validation: parse the date again if it changed
+        copy = super().model_copy(update=update, deep=deep)
+        if update and "date" in update:
+            copy._parse_date()
+        return copy
+
+    @property
+    def ordinal(self) -> int:
+        """The day of the meal as an ordinal (`date.toordinal()`), in its own timezone."""
+        return self._ordinal
+
+    @property
+    def timestamp(self) -> float:
+        """The start of the meal as a UTC timestamp (midnight UTC for all-day dates)."""
+        return self._timestamp
+
+    @property
+    def day(self) -> Date:
+        """The day of the meal."""
+        return Date.fromordinal(self.ordinal)
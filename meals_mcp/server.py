@@ -1,16 +1,226 @@
+import argparse
 import asyncio
+import contextlib
+import datetime
+import os
 import sys
+import weakref
+from pydantic import AnyUrl
 from mcp.server import Server
-from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
+from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource, Resource, ResourceTemplate, ResourcesCapability, SubscribeRequest
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from meals_mcp.utils.notion import NotionClient
+from meals_mcp.utils.history import MealHistory
+from meals_mcp.utils.dates import last_days_window, to_ordinal
+
+# The analytics and search modules are imported by the tools that use them,
+# keeping them out of the server's cold start.
+
+class MealsServer(Server):
+    """MCP server advertising resource subscriptions when a handler is registered."""
+
+    def get_capabilities(self, notification_options, experimental_capabilities):
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if SubscribeRequest in self.request_handlers:
+            if capabilities.resources is None:
+                capabilities.resources = ResourcesCapability(subscribe=True)
+            else:
+                capabilities.resources.subscribe = True
+        return capabilities
 
 # Initialize the server
-app = Server("meals-mcp")
+app = MealsServer("meals-mcp")
+
+# Full meal history shared by the analytics tools, refreshed when stale
+history = MealHistory()
+
+# Notion client shared by all sessions (and its HTTP connection pool)
+_client = None
+
+# Journal of the write-behind queue; updates are sent synchronously when unset
+WRITE_BEHIND_JOURNAL = None
+_write_queue = None
+
+# Seconds between two polls for meals edited in Notion; no polling when unset
+CHANGE_POLL_INTERVAL = None
+_change_feed = None
+
+# Resource URIs each session subscribed to
+_subscriptions = weakref.WeakKeyDictionary()
+
+# Maximum number of tool calls a single session may run at the same time
+MAX_CONCURRENT_CALLS_PER_SESSION = 4
+_session_slots = weakref.WeakKeyDictionary()
+
+def get_client() -> NotionClient:
+    """Return the shared Notion client, creating it on first use.
+
+    When MEALS_SNAPSHOT points to a snapshot file, meals are read from it instead;
+    when MEALS_SOURCES lists several meal databases, they are all queried.
+    """
+    global _client
+    if _client is None:
+        snapshot_path = os.environ.get("MEALS_SNAPSHOT")
+        if snapshot_path:
+            from meals_mcp.utils.snapshot import SnapshotClient
+
+            _client = SnapshotClient(snapshot_path)
+        elif os.environ.get("MEALS_SOURCES"):
+            from meals_mcp.utils.sources import MultiSourceClient
+
+            _client = MultiSourceClient.from_env(NotionClient)
+        else:
+            _client = NotionClient()
+    return _client
+
+def get_write_queue():
+    """Return the write-behind queue if enabled, creating it on first use."""
+    global _write_queue
+    if _write_queue is None and WRITE_BEHIND_JOURNAL:
+        from meals_mcp.utils.writebehind import WriteBehindQueue
+
+        _write_queue = WriteBehindQueue(get_client(), WRITE_BEHIND_JOURNAL, history=history)
+    return _write_queue
+
+@contextlib.asynccontextmanager
+async def background_tasks():
+    """Run the server's background tasks for the lifetime of the transport."""
+    global _change_feed
+    tasks = []
+    write_queue = get_write_queue()
+    if write_queue is not None:
+        tasks.append(asyncio.create_task(write_queue.run()))
+    if CHANGE_POLL_INTERVAL:
+        from meals_mcp.utils.changes import ChangeFeed
+
+        _change_feed = ChangeFeed(get_client(), CHANGE_POLL_INTERVAL, on_change=notify_changes)
+        tasks.append(asyncio.create_task(_change_feed.run()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def close_client() -> None:
+    """Close the shared Notion client, if any."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def session_slot():
+    """Return the semaphore limiting concurrent tool calls of the current session."""
+    try:
+        session = app.request_context.session
+    except LookupError:
+        # Called outside of an MCP request (e.g. directly from tests)
+        return contextlib.nullcontext()
+    slot = _session_slots.get(session)
+    if slot is None:
+        slot = asyncio.Semaphore(MAX_CONCURRENT_CALLS_PER_SESSION)
+        _session_slots[session] = slot
+    return slot
+
+async def notify_changes(meals: list) -> None:
+    """Apply meals edited in Notion to the cached history and notify the subscribed sessions."""
+    from meals_mcp.utils.resources import meal_resource_uris
+
+    uris = set()
+    for meal in meals:
+        uris |= meal_resource_uris(meal)
+        # A meal moved to another week also changes its previous week
+        previous = next((cached for cached in history.meals if cached.id == meal.id), None)
+        if previous is not None:
+            uris |= meal_resource_uris(previous)
+        if not history.is_stale:
+            await asyncio.to_thread(history.apply_update, meal)
+
+    for session, subscribed in list(_subscriptions.items()):
+        for uri in sorted(subscribed & uris):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+            except Exception:
+                # The session is gone
+                _subscriptions.pop(session, None)
+                break
+
+@app.list_resources()
+async def list_resources() -> list[Resource]:
+    """List the meal history resources."""
+    from meals_mcp.utils.dates import DateIndex
+    from meals_mcp.utils.resources import RECENT_LIMIT, RECENT_URI, iso_week, resource_meta, week_range, week_uri
+
+    today = datetime.date.today()
+    resources = [
+        (RECENT_URI, "recent_meals", "Recent meals", f"The {RECENT_LIMIT} most recent meals."),
+        (week_uri(today), "this_week_meals", "This week's meals", f"The meals of the current week ({iso_week(today)})."),
+        (week_uri(today - datetime.timedelta(days=7)), "last_week_meals", "Last week's meals", "The meals of the previous week."),
+    ]
+
+    versions = {}
+    if not history.is_stale:
+        # Only describe versions already known: listing never fetches the history
+        def describe(index: DateIndex):
+            metas = {RECENT_URI: resource_meta(index.recent(RECENT_LIMIT))}
+            for uri, *_ in resources[1:]:
+                metas[uri] = resource_meta(index.range(*week_range(uri.rsplit("/", 1)[1])))
+            return metas
+
+        versions = await asyncio.to_thread(history.query, "dates", DateIndex, describe)
+
+    return [
+        Resource(uri=uri, name=name, title=title, description=description, mimeType="application/json", _meta=versions.get(uri))
+        for uri, name, title, description in resources
+    ]
+
+@app.list_resource_templates()
+async def list_resource_templates() -> list[ResourceTemplate]:
+    """List the templates of the meal history resources."""
+    from meals_mcp.utils.resources import MEAL_URI_TEMPLATE, WEEK_URI_TEMPLATE
+
+    return [
+        ResourceTemplate(uriTemplate=WEEK_URI_TEMPLATE, name="week_meals", title="Meals of a week", description="The meals of an ISO week (e.g. 2026-W07), most recent first.", mimeType="application/json"),
+        ResourceTemplate(uriTemplate=MEAL_URI_TEMPLATE, name="meal", title="Meal", description="A meal, by its Notion page ID.", mimeType="application/json"),
+    ]
+
+@app.read_resource()
+async def read_resource(uri) -> list[ReadResourceContents]:
+    """Serve a meal history resource from the cached history, with its version in `_meta`."""
+    from meals_mcp.utils.dates import DateIndex
+    from meals_mcp.utils.resources import RECENT_LIMIT, parse_uri, render, resource_meta, week_range
+
+    kind, argument = parse_uri(uri)
+    if kind == "recent":
+        result = await query_history("dates", DateIndex, lambda index: index.recent(RECENT_LIMIT))
+        meals = result
+    elif kind == "week":
+        start_date, end_date = week_range(argument)
+        result = await query_history("dates", DateIndex, lambda index: index.range(start_date, end_date))
+        meals = result
+    else:
+        result = await query_history("dates", DateIndex, lambda index: index.get(argument))
+        if result is None:
+            raise ValueError(f"Meal not found: {argument}")
+        meals = [result]
+    return [ReadResourceContents(content=render(result), mime_type="application/json", meta=resource_meta(meals))]
+
+@app.subscribe_resource()
+async def subscribe_resource(uri) -> None:
+    """Notify the current session when the resource changes."""
+    _subscriptions.setdefault(app.request_context.session, set()).add(str(uri))
+
+@app.unsubscribe_resource()
+async def unsubscribe_resource(uri) -> None:
+    """Stop notifying the current session about the resource."""
+    _subscriptions.get(app.request_context.session, set()).discard(str(uri))
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
+    from meals_mcp.utils.stats import PERIODS
+
     return [
         Tool(
             name="get_recent_meals",
@@ -31,9 +241,13 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "The end date for filtering meals (ISO 8601 format, e.g., '2023-10-31'). If provided, retrieves meals on or before this date."
                     },
+                    "days": {
+                        "type": "integer",
+                        "description": "Only retrieve meals from the last N days (today included)."
+                    },
                     "search_query": {
                         "type": "string",
-                        "description": "A search term to filter meals by name (e.g., 'pasta')."
+                        "description": "A search term to filter meals by name or ingredient (e.g., 'pasta'). Accents, plurals and small typos are tolerated; results are sorted by relevance."
                     }
                 }
             }
@@ -75,22 +289,155 @@ async def list_tools() -> list[Tool]:
                     }
                 }
             }
+        ),
+        Tool(
+            name="get_meal_stats",
+            description="Computes compact statistics over the whole meal history: most frequent ingredients, or for a given ingredient its count, last time it was eaten, frequency per period and the ingredients it is most often paired with.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ingredient": {
+                        "type": "string",
+                        "description": "An ingredient to analyse (e.g., 'poulet'). If omitted, returns the most frequent ingredients."
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Only count meals on or after this date (ISO 8601, YYYY-MM-DD)."
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "Only count meals on or before this date (ISO 8601, YYYY-MM-DD)."
+                    },
+                    "period": {
+                        "type": "string",
+                        "enum": list(PERIODS),
+                        "description": "Bucket size for the ingredient frequency (default: 'month').",
+                        "default": "month"
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Number of ingredients to list (default: 10).",
+                        "default": 10
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="find_similar_meals",
+            description="Finds meals from the history whose ingredients are most similar to a given meal, optionally excluding some ingredients (e.g., 'something like the curry but without chickpeas').",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "meal_id": {
+                        "type": "string",
+                        "description": "The Notion Page ID of the reference meal."
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "Name of the reference meal if the ID is unknown."
+                    },
+                    "exclude_ingredients": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Ingredients the suggested meals must not contain."
+                    },
+                    "k": {
+                        "type": "integer",
+                        "description": "The number of meals to suggest (default: 5).",
+                        "default": 5
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="commit_meal_plan",
+            description="Saves a meal plan to the database in one operation: each planned meal is matched with the existing meal of the same date and time (midi/soir), which is created if missing or renamed if different. Committing the same plan again changes nothing.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "meals": {
+                        "type": "array",
+                        "description": "The planned days.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "date": {
+                                    "type": "string",
+                                    "description": "The day (ISO 8601, YYYY-MM-DD)."
+                                },
+                                "midi": {
+                                    "type": "string",
+                                    "description": "The meal planned for noon, if any."
+                                },
+                                "soir": {
+                                    "type": "string",
+                                    "description": "The meal planned for the evening, if any."
+                                }
+                            },
+                            "required": ["date"]
+                        }
+                    }
+                },
+                "required": ["meals"]
+            }
+        ),
+        Tool(
+            name="get_server_status",
+            description="Reports the state of the server caches and of the Notion traffic (e.g., how many identical reads were coalesced).",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "clear_failed_writes": {
+                        "type": "boolean",
+                        "description": "Forget the failed writes once reported (they are not retried)."
+                    }
+                }
+            }
         )
     ]
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool execution."""
+    async with session_slot():
+        return await run_tool(name, arguments)
+
+async def run_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Execute a tool."""
     if name == "get_recent_meals":
         limit = arguments.get("limit", 30)
         start_date = arguments.get("start_date")
         end_date = arguments.get("end_date")
         search_query = arguments.get("search_query")
+        days = arguments.get("days")
+
+        # Without explicit bounds, `days` is answered by DateIndex.last_days
+        last_days = days if days and not (start_date or end_date) else None
+        if days:
+            today = datetime.date.today()
+            first_day, last_day = last_days_window(days, today)
+            start_date = start_date or first_day
+            end_date = end_date or last_day
         
         try:
-            client = NotionClient()
-            # Run the synchronous Notion client in a thread
-            meals = await asyncio.to_thread(client.get_meals, limit=limit, start_date=start_date, end_date=end_date, search_query=search_query)
+            client = get_client()
+            if search_query:
+                meals = await search_meals(search_query, start_date=start_date, end_date=end_date)
+                meals = meals[:limit]
+            elif start_date or end_date:
+                from meals_mcp.utils.dates import DateIndex
+
+                # Date ranges are answered from the cached history, sorted by parsed date
+                if last_days:
+                    meals = await query_history("dates", DateIndex, lambda index: index.last_days(last_days, today)[:limit])
+                else:
+                    meals = await query_history("dates", DateIndex, lambda index: index.range(start_date, end_date)[:limit])
+            else:
+                # Run the synchronous Notion client in a thread
+                meals = await asyncio.to_thread(client.get_meals, limit=limit, start_date=start_date, end_date=end_date, search_query=search_query)
+                write_queue = get_write_queue()
+                if write_queue is not None:
+                    meals = write_queue.apply_pending(meals)
             
             if not meals:
                 return [TextContent(type="text", text="No meals found within the specified criteria.")]
@@ -106,7 +453,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 ingredients_str = ", ".join(meal.ingredients) if meal.ingredients else "No ingredients"
                 recipe_link = f" (Recipe: {meal.recipe})" if meal.recipe else ""
                 # Include ID for reference
-                meal_list_str += f"- **{meal.name}** ({meal.date}, {meal.heure})\n"
+                source_str = f" [{meal.source}]" if meal.source else ""
+                meal_list_str += f"- **{meal.name}** ({meal.date}, {meal.heure}){source_str}\n"
                 meal_list_str += f"  Ingredients: {ingredients_str}{recipe_link}\n"
                 meal_list_str += f"  ID: {meal.id}\n"
 
@@ -125,7 +473,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         ingredients = arguments.get("ingredients")
         recipe = arguments.get("recipe")
         
-        client = NotionClient()
+        client = get_client()
 
         if meal_id:
             try:
@@ -135,10 +483,18 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 if heure: updates["heure"] = heure
                 if ingredients is not None: updates["ingredients"] = ingredients
                 if recipe: updates["recipe"] = recipe
+
+                write_queue = get_write_queue()
+                if write_queue is not None and updates:
+                    queued_meal = await asyncio.to_thread(write_queue.submit, meal_id, updates)
+                    if queued_meal:
+                        return [TextContent(type="text", text=f"Successfully updated meal (saved locally, syncing to Notion):\n- **{queued_meal.name}** ({queued_meal.date}, {queued_meal.heure})\n  ID: {queued_meal.id}")]
+                    return [TextContent(type="text", text=f"Update of meal {meal_id} saved locally, syncing to Notion.")]
                 
                 updated_meal = await asyncio.to_thread(client.update_meal, meal_id=meal_id, updates=updates)
                 
                 if updated_meal:
+                    await asyncio.to_thread(history.apply_update, updated_meal)
                     return [TextContent(type="text", text=f"Successfully updated meal:\n- **{updated_meal.name}** ({updated_meal.date}, {updated_meal.heure})\n  ID: {updated_meal.id}")]
                 else:
                     return [TextContent(type="text", text=f"Failed to update meal with ID {meal_id}.")]
@@ -147,7 +503,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
         elif name_search:
             try:
-                meals = await asyncio.to_thread(client.get_meals, search_query=name_search)
+                meals = await search_meals(name_search, include_ingredients=False)
+                meals = meals[:30] # Same default page size as get_meals
                 
                 if not meals:
                     return [TextContent(type="text", text=f"No meal found with name '{name_search}'.")]
@@ -169,19 +526,230 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         else:
              return [TextContent(type="text", text="Please provide either `meal_id` (to update) or `name_search` (to find the meal first).")]
 
+    elif name == "get_meal_stats":
+        ingredient = arguments.get("ingredient")
+        start_date = arguments.get("start_date")
+        end_date = arguments.get("end_date")
+        period = arguments.get("period", "month")
+        top = arguments.get("top", 10)
+
+        try:
+            from meals_mcp.utils.stats import MealStats
+
+            text = await query_history("stats", MealStats, lambda stats: format_meal_stats(stats, ingredient, start_date, end_date, period, top))
+            return [TextContent(type="text", text=text)]
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error computing meal statistics: {str(e)}")]
+
+    elif name == "find_similar_meals":
+        meal_id = arguments.get("meal_id")
+        meal_name = arguments.get("name")
+        exclude_ingredients = arguments.get("exclude_ingredients") or []
+        k = arguments.get("k", 5)
+
+        if not meal_id and not meal_name:
+            return [TextContent(type="text", text="Please provide either `meal_id` or `name` of the reference meal.")]
+
+        try:
+            from meals_mcp.utils.similarity import SimilarityIndex
+
+            def find_similar(index: SimilarityIndex):
+                reference = index.find(meal_id=meal_id, name=meal_name)
+                if not reference:
+                    return None, []
+                return reference, index.similar(reference, k=k, exclude_ingredients=exclude_ingredients)
+
+            reference, similar = await query_history("similarity", SimilarityIndex, find_similar)
+            if not reference:
+                return [TextContent(type="text", text=f"No meal found matching '{meal_id or meal_name}'.")]
+
+            if not similar:
+                return [TextContent(type="text", text=f"No similar meals found for '{reference.name}'.")]
+
+            excluded_str = f" without {', '.join(exclude_ingredients)}" if exclude_ingredients else ""
+            meal_list_str = f"Meals similar to **{reference.name}**{excluded_str}:\n\n"
+            for meal, score, shared in similar:
+                meal_list_str += f"- **{meal.name}** (last: {meal.date}, similarity: {score:.2f})\n"
+                meal_list_str += f"  Shared ingredients: {', '.join(shared)}\n"
+                meal_list_str += f"  ID: {meal.id}\n"
+
+            return [TextContent(type="text", text=meal_list_str)]
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error finding similar meals: {str(e)}")]
+
+    elif name == "commit_meal_plan":
+        plans = arguments.get("meals") or []
+        if not plans:
+            return [TextContent(type="text", text="Please provide the `meals` of the plan to commit.")]
+
+        try:
+            from meals_mcp.utils.plans import commit_plan
+
+            result = await asyncio.to_thread(commit_plan, get_client(), plans)
+            for meal in result["created"] + result["updated"]:
+                await asyncio.to_thread(history.apply_update, meal)
+            return [TextContent(type="text", text=format_commit_result(result))]
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error committing meal plan: {str(e)}")]
+
+    elif name == "get_server_status":
+        from meals_mcp.utils import notion
+
+        read_stats = notion.reads.stats()
+        status_str = "Server status:\n"
+        if history.is_stale:
+            status_str += "- Meal history: not loaded or stale\n"
+        else:
+            status_str += f"- Meal history: {len(history.meals)} meals cached (version {history.version})\n"
+        status_str += f"- Notion reads: {read_stats['calls']} requested, {read_stats['executions']} sent, {read_stats['coalesced']} coalesced ({read_stats['coalescing_rate']:.0%})\n"
+        write_queue = get_write_queue()
+        if write_queue is not None:
+            write_status = write_queue.status()
+            status_str += f"- Pending writes: {write_status['pending']} (on {write_status['pending_pages']} meals)\n"
+            status_str += f"- Failed writes: {len(write_status['failed'])}\n"
+            for failure in write_status["failed"]:
+                status_str += f"  - Meal {failure['meal_id']} {failure['updates']}: {failure['error']}\n"
+            if arguments.get("clear_failed_writes") and write_status["failed"]:
+                cleared = await asyncio.to_thread(write_queue.discard_failed)
+                status_str += f"  ({cleared} failed writes cleared)\n"
+        if _change_feed is not None:
+            status_str += f"- Change feed: {_change_feed.polls} polls, {_change_feed.changes} edited meals detected (last edit seen: {_change_feed.watermark or 'none'})\n"
+        return [TextContent(type="text", text=status_str)]
+
     raise ValueError(f"Tool not found: {name}")
 
+async def query_history(key: str, builder, query):
+    """Run `query` on a structure derived from the fresh shared history, off the event loop."""
+    def run_query():
+        history.ensure_fresh(get_client())
+        return history.query(key, builder, query)
+
+    return await asyncio.to_thread(run_query)
+
+async def search_meals(query: str, start_date: str = None, end_date: str = None, include_ingredients: bool = True) -> list:
+    """Search the meal history with the fuzzy index, most relevant first."""
+    from meals_mcp.utils.search import SearchIndex
+
+    results = await query_history("search", SearchIndex, lambda index: index.search(query, include_ingredients=include_ingredients))
+    start = to_ordinal(start_date) if start_date else None
+    end = to_ordinal(end_date) if end_date else None
+    meals = []
+    for meal, _ in results:
+        if start is not None and meal.ordinal < start:
+            continue
+        if end is not None and meal.ordinal > end:
+            continue
+        meals.append(meal)
+    return meals
+
+def format_meal_stats(stats: "MealStats", ingredient: str = None, start_date: str = None, end_date: str = None, period: str = "month", top: int = 10) -> str:
+    """Render meal statistics as a compact text summary."""
+    total = stats.total(start_date, end_date)
+    range_str = f"from {start_date or 'beginning'} to {end_date or 'now'}"
+
+    if not ingredient:
+        top_ingredients = stats.top_ingredients(top, start_date, end_date)
+        if not top_ingredients:
+            return f"No meals found {range_str}."
+        text = f"Meal statistics {range_str}: {total} meals.\n\nMost frequent ingredients:\n"
+        for name, count, last_seen in top_ingredients:
+            text += f"- {name}: {count} meals ({count * 100 // total}%), last seen {last_seen}\n"
+        return text
+
+    count = stats.count(ingredient, start_date, end_date)
+    if not count:
+        return f"No meals found with ingredient '{ingredient}' {range_str}."
+
+    text = f"Statistics for '{ingredient}' {range_str}:\n"
+    text += f"- Eaten in {count} of {total} meals ({count * 100 // total}%)\n"
+    text += f"- Last seen: {stats.last_seen(ingredient, end_date)}\n"
+    text += f"\nFrequency by {period}:\n"
+    for bucket, bucket_count in stats.frequency(ingredient, period, start_date, end_date):
+        text += f"- {bucket}: {bucket_count}\n"
+
+    pairs = stats.cooccurrence(ingredient, top, start_date, end_date)
+    if pairs:
+        text += "\nOften paired with:\n"
+        for name, pair_count in pairs:
+            text += f"- {name}: {pair_count}\n"
+    return text
+
+def format_commit_result(result: dict) -> str:
+    """Render the outcome of a plan commit."""
+    text = f"Meal plan committed: {len(result['created'])} created, {len(result['updated'])} updated, {len(result['unchanged'])} unchanged, {len(result['failed'])} failed.\n"
+    for kind in ("created", "updated"):
+        for meal in result[kind]:
+            text += f"- {kind.capitalize()}: **{meal.name}** ({meal.date}, {meal.heure})\n  ID: {meal.id}\n"
+    for failure in result["failed"]:
+        meal = failure["meal"]
+        text += f"- Failed: **{meal.name}** ({meal.date}, {meal.heure}): {failure['error']}\n"
+    return text
+
 async def main():
     # run the server using stdio
-    async with stdio_server() as (read_stream, write_stream):
+    async with background_tasks(), stdio_server() as (read_stream, write_stream):
         await app.run(
             read_stream,
             write_stream,
             app.create_initialization_options()
         )
 
+def create_http_app():
+    """Build the ASGI app serving all MCP clients over streamable HTTP on `/mcp`."""
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+
+    session_manager = StreamableHTTPSessionManager(app=app)
+
+    async def handle_streamable_http(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(starlette_app):
+        try:
+            async with session_manager.run(), background_tasks():
+                yield
+        finally:
+            # Sessions are closed: release the shared Notion connections
+            close_client()
+
+    return Starlette(routes=[Mount("/mcp", app=handle_streamable_http)], lifespan=lifespan)
+
+def main_http(host: str, port: int, graceful_shutdown_timeout: int = 10):
+    # run a single server process shared by all clients over HTTP
+    import uvicorn
+
+    uvicorn.run(create_http_app(), host=host, port=port, timeout_graceful_shutdown=graceful_shutdown_timeout)
+
 def run():
-    asyncio.run(main())
+    global MAX_CONCURRENT_CALLS_PER_SESSION, WRITE_BEHIND_JOURNAL, CHANGE_POLL_INTERVAL
+
+    parser = argparse.ArgumentParser(prog="meals-mcp-server", description="Meals MCP server.")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio", help="'stdio' for one client per process (default), 'http' to serve many clients over streamable HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind in HTTP mode (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind in HTTP mode (default: 8000).")
+    parser.add_argument("--max-concurrent-calls", type=int, default=MAX_CONCURRENT_CALLS_PER_SESSION, help=f"Maximum number of concurrent tool calls per session (default: {MAX_CONCURRENT_CALLS_PER_SESSION}).")
+    parser.add_argument("--write-behind", metavar="JOURNAL", help="Save updates to this local journal and apply them to Notion in the background.")
+    parser.add_argument("--poll-changes", type=float, metavar="SECONDS", help="Poll Notion for edited meals every SECONDS, notifying subscribed clients and updating the caches.")
+    parser.add_argument("--profile-startup", action="store_true", help="Print an import-time breakdown and the time to the initialize response, then exit.")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from meals_mcp.utils.startup import startup_report
+
+        # stdout is reserved for the MCP protocol
+        print(startup_report(), file=sys.stderr)
+        return
+
+    MAX_CONCURRENT_CALLS_PER_SESSION = args.max_concurrent_calls
+    WRITE_BEHIND_JOURNAL = args.write_behind
+    CHANGE_POLL_INTERVAL = args.poll_changes
+
+    if args.transport == "http":
+        main_http(args.host, args.port)
+    else:
+        asyncio.run(main())
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import date as Date
+from typing import Callable, Dict, List, Optional
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import to_ordinal
+from meals_mcp.utils.plans import HEURES, plan_meals
+from meals_mcp.utils.search import normalize_text
+
+# Environment variable pointing to the recipe card cache file
+CARD_CACHE_ENV = "MEALS_CARD_CACHE"
+DEFAULT_CARD_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "meals-mcp", "recipe_cards.json")
+
+# Cards kept in the cache; the least recently used are evicted first
+MAX_CARDS = 500
+
+WEEKDAYS = ("Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche")
+
+def card_key(name: str) -> str:
+    return normalize_text(name)
+
+def card_version(model_name: str, *prompts: str) -> str:
+    """
+    Version of the generated cards: changes with the model or the prompts,
+    which makes the cards generated before stale.
+    """
+    digest = hashlib.sha256("\0".join(prompts).encode("utf-8")).hexdigest()[:12]
+    return f"{model_name}:{digest}"
+
+class RecipeCardCache:
+    """
+    Persistent cache of recipe cards, keyed by normalized meal name.
+
+    Cards generated with another model or prompt version are ignored. The
+    cache holds at most `max_cards` cards, evicting the least recently used,
+    and is written atomically to a JSON file.
+    """
+
+    def __init__(self, path: Optional[str], version: str, max_cards: int = MAX_CARDS):
+        self.path = path
+        self.version = version
+        self.max_cards = max_cards
+        self._lock = threading.Lock()
+        # key -> {"name", "card", "used"}, "used" being a counter of accesses
+        self._cards: Dict[str, dict] = {}
+        self._tick = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable recipe card cache {self.path}: {e}")
+            return
+        if data.get("version") == self.version:
+            self._cards = data.get("cards", {})
+            self._tick = max((entry["used"] for entry in self._cards.values()), default=0)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __contains__(self, name: str) -> bool:
+        # Unlike `get`, checking for a card does not count as a use
+        return card_key(name) in self._cards
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cards.get(card_key(name))
+            if entry is None:
+                return None
+            self._tick += 1
+            entry["used"] = self._tick
+            return entry["card"]
+
+    def put(self, name: str, card: str) -> None:
+        with self._lock:
+            self._tick += 1
+            self._cards[card_key(name)] = {"name": name, "card": card, "used": self._tick}
+            if len(self._cards) > self.max_cards:
+                by_use = sorted(self._cards, key=lambda key: self._cards[key]["used"])
+                for key in by_use[:len(self._cards) - self.max_cards]:
+                    del self._cards[key]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": self.version, "cards": self._cards}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+def plan_slots(plans) -> List[Meal]:
+    """
+    Returns the meals of the plans, in day order.
+    """
+    order = {heure: i for i, (_, heure) in enumerate(HEURES)}
+    return sorted(plan_meals(plans), key=lambda meal: (meal.ordinal, order[meal.heure]))
+
+def _day_label(date: str) -> str:
+    day = Date.fromordinal(to_ordinal(date))
+    return f"{WEEKDAYS[day.weekday()]} {day.strftime('%d/%m')}"
+
+def recipe_cards(
+    plans,
+    cache: RecipeCardCache,
+    generate: Callable[[List[str]], Dict[str, str]],
+    meals: Optional[List[Meal]] = None,
+    store: Optional[Callable[[str, str], None]] = None,
+) -> str:
+    """
+    Builds the recipe cards of a plan, in day order.
+
+    Cards are taken from the cache, which is first completed with the cards
+    stored on the `meals` pages; only the remaining meals are passed to
+    `generate` (one call returning {meal name: card}). New cards are cached,
+    and if `store` is given, written to the `meals` pages planned in the
+    same slot.
+    """
+    slots = plan_slots(plans)
+    meals = meals or []
+    for meal in meals:
+        if meal.card and meal.name not in cache:
+            cache.put(meal.name, meal.card)
+
+    cards: Dict[str, str] = {}
+    missing: Dict[str, str] = {}
+    for slot in slots:
+        key = card_key(slot.name)
+        if key in cards or key in missing:
+            continue
+        card = cache.get(slot.name)
+        if card is None:
+            missing[key] = slot.name
+        else:
+            cards[key] = card
+
+    if missing:
+        generated = {card_key(name): card for name, card in generate(list(missing.values())).items() if card}
+        for key, name in missing.items():
+            card = generated.get(key)
+            if card:
+                cards[key] = card
+                cache.put(name, card)
+
+    if store is not None:
+        pages = {(meal.ordinal, meal.heure.casefold()): meal for meal in meals if meal.id}
+        for slot in slots:
+            page = pages.get((slot.ordinal, slot.heure.casefold()))
+            card = cards.get(card_key(slot.name))
+            if page is None or not card or card_key(page.name) != card_key(slot.name) or page.card == card:
+                continue
+            try:
+                store(page.id, card)
+            except Exception as e:
+                print(f"Could not store the recipe card of {slot.name}: {e}")
+    cache.save()
+
+    sections = []
+    shown = set()
+    for slot in slots:
+        key = card_key(slot.name)
+        section = f"### 📅 {_day_label(slot.date)}, {slot.heure}: {slot.name}\n\n"
+        if key in shown:
+            section += "_Voir la fiche plus haut._"
+        elif key in cards:
+            section += cards[key].strip()
+            shown.add(key)
+        else:
+            section += "_Fiche indisponible._"
+        sections.append(section)
+    return "\n\n".join(sections) + "\n"
@@ -0,0 +1,83 @@
+import asyncio
+import sys
+from typing import Awaitable, Callable, Dict, List, Optional
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import parse_date
+
+# Seconds between two polls of the meals database
+POLL_INTERVAL_SECONDS = 30
+
+def _fingerprint(meal: Meal) -> str:
+    return meal.model_dump_json(exclude={"last_edited_time", "source"})
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    return parse_date(value)[1] if value else None
+
+class ChangeFeed:
+    """
+    Detects meals edited in Notion by polling the pages in `last_edited_time`
+    order, down to the last edit already seen (the watermark).
+
+    Notion rounds `last_edited_time` to the minute, so the pages edited in
+    the watermark's minute are read again on the next poll: their content is
+    remembered to tell a new edit from one already reported. The first poll
+    only sets the watermark. Archived pages are not reported.
+    """
+
+    def __init__(self, client, interval: float = POLL_INTERVAL_SECONDS, on_change: Optional[Callable[[List[Meal]], Awaitable[None]]] = None):
+        self.client = client
+        self.interval = interval
+        self.on_change = on_change
+        self.watermark: Optional[str] = None
+        # meal_id -> fingerprint of the meals edited at the watermark
+        self._at_watermark: Dict[str, str] = {}
+        self.polls = 0
+        self.changes = 0
+
+    def poll(self) -> List[Meal]:
+        """
+        Returns the meals edited since the previous poll, most recent first.
+        """
+        meals = [meal for meal in self.client.get_changed_meals(since=self.watermark) if meal.last_edited_time]
+        self.polls += 1
+        baseline = self.watermark is None
+        watermark = _timestamp(self.watermark)
+
+        changed = []
+        for meal in meals:
+            edited = _timestamp(meal.last_edited_time)
+            if watermark is not None and edited < watermark:
+                continue
+            if edited == watermark and self._at_watermark.get(meal.id) == _fingerprint(meal):
+                continue
+            changed.append(meal)
+
+        if meals:
+            newest = max(meals, key=lambda meal: _timestamp(meal.last_edited_time))
+            if watermark is None or _timestamp(newest.last_edited_time) > watermark:
+                self.watermark = newest.last_edited_time
+                self._at_watermark = {}
+            watermark = _timestamp(self.watermark)
+            for meal in meals:
+                if _timestamp(meal.last_edited_time) == watermark:
+                    self._at_watermark[meal.id] = _fingerprint(meal)
+
+        if baseline:
+            return []
+        self.changes += len(changed)
+        return changed
+
+    async def run(self) -> None:
+        """
+        Polls for changes until cancelled, passing the edited meals to `on_change`.
+        """
+        while True:
+            try:
+                changed = await asyncio.to_thread(self.poll)
+            except Exception as e:
+                # stdout is reserved for the MCP protocol
+                print(f"Error polling meal changes: {e}", file=sys.stderr)
+                changed = []
+            if changed and self.on_change is not None:
+                await self.on_change(changed)
+            await asyncio.sleep(self.interval)
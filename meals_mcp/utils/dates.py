@@ -0,0 +1,106 @@
+from bisect import bisect_left, bisect_right
+from datetime import date as Date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+def parse_date(value: str) -> Tuple[int, float]:
+    """
+    Parses a Notion date ('YYYY-MM-DD' or an ISO 8601 datetime, possibly
+    with a timezone) into (ordinal day, UTC timestamp).
+
+    The ordinal is the calendar day as written, in the meal's own timezone.
+    Dates without a time count as midnight UTC, naive datetimes as UTC.
+    Meals parse their date once, when they are created.
+    """
+    if len(value) <= 10:
+        day = Date.fromisoformat(value)
+        moment = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    else:
+        # Python < 3.11 does not accept the 'Z' suffix
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        day = moment.date()
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    return day.toordinal(), moment.timestamp()
+
+def to_ordinal(value: str) -> int:
+    return parse_date(value)[0]
+
+def last_days_window(days: int, today: Optional[Date] = None) -> Tuple[str, str]:
+    """
+    Returns the first and last ISO days of the last `days` days, today included.
+    """
+    today = today or Date.today()
+    return (today - timedelta(days=days - 1)).isoformat(), today.isoformat()
+
+def date_key(meal) -> Tuple[int, float, str]:
+    """
+    Sort key of a meal: its day, then its time, then its ID.
+    """
+    return meal.ordinal, meal.timestamp, meal.id or ""
+
+class DateIndex:
+    """
+    Meals kept sorted by (day, time), answering range queries by bisection.
+
+    Supports incremental updates so it can stay attached to the meal history.
+    """
+
+    def __init__(self, meals: List = None):
+        entries = sorted(((date_key(meal), meal) for meal in meals or []), key=lambda entry: entry[0])
+        self._keys: List[Tuple[int, float, str]] = [key for key, _ in entries]
+        self._meals: List = [meal for _, meal in entries]
+        self._keys_by_id: Dict[str, Tuple[int, float, str]] = {key[2]: key for key in self._keys if key[2]}
+
+    def __len__(self) -> int:
+        return len(self._meals)
+
+    def get(self, meal_id: str):
+        """
+        Returns the meal with the given ID, or None.
+        """
+        key = self._keys_by_id.get(meal_id)
+        if key is None:
+            return None
+        return self._meals[bisect_left(self._keys, key)]
+
+    def recent(self, limit: int) -> List:
+        """
+        Returns the `limit` most recent meals, most recent first.
+        """
+        if limit <= 0:
+            return []
+        return self._meals[-limit:][::-1]
+
+    def remove(self, meal_id: str) -> None:
+        key = self._keys_by_id.pop(meal_id, None)
+        if key is None:
+            return
+        i = bisect_left(self._keys, key)
+        del self._keys[i], self._meals[i]
+
+    def add(self, meal) -> None:
+        if meal.id:
+            self.remove(meal.id)
+        key = date_key(meal)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._meals.insert(i, meal)
+        if meal.id:
+            self._keys_by_id[meal.id] = key
+
+    def update(self, meal) -> None:
+        self.add(meal)
+
+    def range(self, start_date: str = None, end_date: str = None) -> List:
+        """
+        Returns the meals between the two days (inclusive), most recent first.
+        """
+        lo = bisect_left(self._keys, (to_ordinal(start_date),)) if start_date else 0
+        hi = bisect_left(self._keys, (to_ordinal(end_date) + 1,)) if end_date else len(self._keys)
+        return self._meals[lo:hi][::-1]
+
+    def last_days(self, days: int, today: Optional[Date] = None) -> List:
+        """
+        Returns the meals of the last `days` days, today included, most recent first.
+        """
+        return self.range(*last_days_window(days, today))
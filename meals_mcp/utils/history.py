@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from meals_mcp.models import Meal
+
+# How long a loaded history is considered fresh before it is fetched again.
+HISTORY_TTL_SECONDS = 300
+
+class MealHistory:
+    """
+    In-memory snapshot of the full 'Repas' history.
+
+    Derived structures (statistics, indexes...) are built lazily from the
+    snapshot and cached until the next refresh. The snapshot may be shared by
+    concurrent sessions: all accesses are serialized by a lock, so blocking
+    callers should run in a worker thread.
+    """
+
+    def __init__(self, ttl: float = HISTORY_TTL_SECONDS):
+        self.ttl = ttl
+        self.meals: List[Meal] = []
+        self.version = 0
+        self._loaded_at: Optional[float] = None
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        # Optional function applied to every loaded snapshot (e.g. local edits not yet in Notion)
+        self.overlay: Optional[Callable[[List[Meal]], List[Meal]]] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def load(self, meals: List[Meal]) -> None:
+        """
+        Replaces the snapshot with the given meals.
+        """
+        with self._lock:
+            if self.overlay is not None:
+                meals = self.overlay(meals)
+            self.meals = list(meals)
+            self.version += 1
+            self._loaded_at = time.monotonic()
+            self._derived = {}
+
+    def refresh(self, client) -> None:
+        """
+        Fetches the full history from Notion.
+        """
+        self.load(client.get_all_meals())
+
+    def ensure_fresh(self, client) -> "MealHistory":
+        """
+        Refreshes the snapshot if it was never loaded or is older than the TTL.
+        """
+        with self._lock:
+            if self.is_stale:
+                self.refresh(client)
+        return self
+
+    def invalidate(self) -> None:
+        """
+        Marks the snapshot as stale so the next access fetches it again.
+        """
+        self._loaded_at = None
+
+    def apply_update(self, meal: Meal) -> None:
+        """
+        Applies a created or updated meal to the snapshot without refetching.
+
+        Derived structures exposing an `update(meal)` method are updated in
+        place; the others are dropped and rebuilt on next access.
+        """
+        if not meal.id:
+            return
+        with self._lock:
+            for i, existing in enumerate(self.meals):
+                if existing.id == meal.id:
+                    self.meals[i] = meal
+                    break
+            else:
+                self.meals.append(meal)
+            self.version += 1
+            self._derived = {
+                key: value for key, value in self._derived.items()
+                if hasattr(value, "update")
+            }
+            for value in self._derived.values():
+                value.update(meal)
+
+    def query(self, key: str, builder: Callable[[List[Meal]], Any], query: Callable[[Any], Any]) -> Any:
+        """
+        Runs `query` on the derived structure registered under `key`, without
+        letting a concurrent refresh or update modify it in the meantime.
+        """
+        with self._lock:
+            return query(self.derived(key, builder))
+
+    def derived(self, key: str, builder: Callable[[List[Meal]], Any]) -> Any:
+        """
+        Returns the structure registered under `key`, building it from the
+        current snapshot on first access.
+        """
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self.meals)
+            return self._derived[key]
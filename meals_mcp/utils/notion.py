@@ -1,7 +1,26 @@
+import hashlib
+import importlib
 import os
-import notion_client
+import sys
+import time
 from typing import List, Optional
 from meals_mcp.models import Meal
+from meals_mcp.utils.dates import parse_date, to_ordinal
+from meals_mcp.utils.schema import MealSchema
+from meals_mcp.utils.singleflight import SingleFlight
+
+# Identical reads in flight at the same time (from any client instance
+# sharing a token) are sent to Notion only once.
+reads = SingleFlight()
+
+# Seconds before introspecting the schema again after a transient error
+SCHEMA_RETRY_SECONDS = 60
+
+def __getattr__(name: str):
+    # `notion_client` pulls in its HTTP stack: only import it when a client is built
+    if name == "notion_client":
+        return importlib.import_module("notion_client")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class NotionClient:
     def __init__(self, auth_token: str = None):
@@ -9,7 +28,21 @@ class NotionClient:
             auth_token = os.environ.get("NOTION_TOKEN") or os.environ.get("NOTION_API_KEY")
         if not auth_token:
             raise ValueError("Notion API token (NOTION_TOKEN or NOTION_API_KEY) not found. Please set the environment variable or pass it to the constructor.")
+        import notion_client
+
         self._client = notion_client.Client(auth=auth_token)
+        # Identifies the workspace in read keys without keeping the token around
+        self._token_key = hashlib.sha256(auth_token.encode()).hexdigest()[:16]
+        self._data_source_id: Optional[str] = None
+        # None until fetched, False if the data source has no usable schema
+        self._schema = None
+        self._schema_retry_at = 0.0
+
+    def close(self):
+        """
+        Closes the underlying HTTP connections.
+        """
+        self._client.close()
 
     def get_users(self):
         """
@@ -19,10 +52,18 @@ class NotionClient:
             users = self._client.users.list()
             return users.get("results", [])
         except Exception as e:
-            print(f"Error fetching users from Notion API: {e}")
+            print(f"Error fetching users from Notion API: {e}", file=sys.stderr)
             return []
 
     def _find_data_source_id(self) -> str:
+        """
+        Returns the ID of the 'Repas' database or data source, discovering it on first use.
+        """
+        if self._data_source_id is None:
+            self._data_source_id = reads.do((self._token_key, "data_source_id"), self._discover_data_source_id)
+        return self._data_source_id
+
+    def _discover_data_source_id(self) -> str:
         """
         Finds the ID of the 'Repas' database or data source.
         """
@@ -68,10 +109,50 @@ class NotionClient:
             
         return data_source_id
 
+    def _get_schema(self) -> Optional[MealSchema]:
+        """
+        Returns the compiled schema of the data source, fetching it on first use.
+        Returns None if it cannot be introspected: pages are then mapped by
+        probing the usual property names.
+
+        A data source without a title or date property is never introspected
+        again; other errors (network, rate limit) are retried after
+        SCHEMA_RETRY_SECONDS.
+        """
+        if self._schema is None and time.monotonic() >= self._schema_retry_at:
+            try:
+                properties = reads.do((self._token_key, "schema"), self._fetch_properties)
+            except Exception as e:
+                print(f"Could not introspect the meals data source schema: {e}", file=sys.stderr)
+                self._schema_retry_at = time.monotonic() + SCHEMA_RETRY_SECONDS
+                return None
+            try:
+                self._schema = MealSchema(properties)
+            except ValueError as e:
+                print(f"Could not introspect the meals data source schema: {e}", file=sys.stderr)
+                self._schema = False
+        return self._schema or None
+
+    def _fetch_properties(self) -> dict:
+        data_source_id = self._find_data_source_id()
+        if hasattr(self._client, "data_sources") and hasattr(self._client.data_sources, "retrieve"):
+            response = self._client.data_sources.retrieve(data_source_id=data_source_id)
+        else:
+            response = self._client.databases.retrieve(database_id=data_source_id)
+        return dict(response.get("properties", {}))
+
     def _map_page_to_meal(self, page: dict) -> Optional[Meal]:
         """
         Maps a Notion page result to a Meal object.
         """
+        schema = self._get_schema()
+        if schema is not None:
+            try:
+                return schema.extract(page)
+            except Exception as e:
+                print(f"Skipping malformed meal entry: {e}", file=sys.stderr)
+                return None
+
         properties = page.get("properties", {})
         try:
             # Name (Title) - Key is likely empty string ""
@@ -116,17 +197,88 @@ class NotionClient:
                 date=date,
                 ingredients=ingredients,
                 heure=heure,
-                recipe=recipe
+                recipe=recipe,
+                card="".join(part.get("plain_text", "") for part in properties.get("Fiche", {}).get("rich_text", [])) or None,
+                last_edited_time=page.get("last_edited_time")
             )
         except Exception as e:
-            print(f"Skipping malformed meal entry: {e}")
+            print(f"Skipping malformed meal entry: {e}", file=sys.stderr)
             return None
 
+    def _query(self, data_source_id: str, query_params: dict) -> dict:
+        """
+        Runs a query against the data source, depending on endpoint availability.
+        """
+        query_params = dict(query_params)
+        if hasattr(self._client, "data_sources") and hasattr(self._client.data_sources, "query"):
+            query_params["data_source_id"] = data_source_id
+            return self._client.data_sources.query(**query_params)
+        elif hasattr(self._client.databases, "query"):
+            query_params["database_id"] = data_source_id
+            return self._client.databases.query(**query_params)
+        else:
+             raise AttributeError("Neither data_sources.query nor databases.query is available on the client.")
+
+    def get_all_meals(self) -> List[Meal]:
+        """
+        Retrieves the full meal history from the 'Repas' database, following pagination.
+        Meals are returned sorted by date, most recent first.
+        """
+        return list(reads.do((self._token_key, "get_all_meals"), self._get_all_meals))
+
+    def _get_all_meals(self) -> List[Meal]:
+        try:
+            data_source_id = self._find_data_source_id()
+            query_params = {
+                "page_size": 100,
+                "sorts": [
+                    {
+                        "property": "Date",
+                        "direction": "descending"
+                    }
+                ]
+            }
+
+            meals = []
+            while True:
+                response = self._query(data_source_id, query_params)
+                for page in response.get("results", []):
+                    meal = self._map_page_to_meal(page)
+                    if meal:
+                        meals.append(meal)
+
+                if not response.get("has_more") or not response.get("next_cursor"):
+                    break
+                query_params["start_cursor"] = response["next_cursor"]
+
+            return meals
+
+        except Exception as e:
+            print(f"Error fetching meal history from Notion API: {e}", file=sys.stderr)
+            raise
+
     def get_meals(self, limit: int = 30, start_date: str = None, end_date: str = None, search_query: str = None) -> List[Meal]:
         """
         Retrieves a list of meals from the 'Repas' database.
         Optionally filters by a date range or search query.
         """
+        query = None
+        if search_query:
+            # Only searches need the search module, keeping it out of the server's cold start
+            from meals_mcp.utils.search import normalize_text
+
+            query = normalize_text(search_query)
+        key = (
+            self._token_key,
+            "get_meals",
+            limit,
+            start_date or None,
+            end_date or None,
+            query,
+        )
+        return list(reads.do(key, self._get_meals, limit, start_date, end_date, search_query))
+
+    def _get_meals(self, limit: int, start_date: Optional[str], end_date: Optional[str], search_query: Optional[str]) -> List[Meal]:
         try:
             data_source_id = self._find_data_source_id()
 
@@ -141,30 +293,42 @@ class NotionClient:
                 ]
             }
 
-            # Handle querying based on endpoint availability
-            if hasattr(self._client, "data_sources") and hasattr(self._client.data_sources, "query"):
-                query_params["data_source_id"] = data_source_id
-                response = self._client.data_sources.query(**query_params)
-            elif hasattr(self._client.databases, "query"):
-                query_params["database_id"] = data_source_id
-                response = self._client.databases.query(**query_params)
-            else:
-                 raise AttributeError("Neither data_sources.query nor databases.query is available on the client.")
+            # Let Notion narrow date ranges down, so the 100 pages fetched are the relevant ones
+            date_conditions = []
+            if start_date:
+                date_conditions.append({"on_or_after": start_date[:10]})
+            if end_date:
+                date_conditions.append({"on_or_before": end_date[:10]})
+            if date_conditions:
+                schema = self._get_schema()
+                date_property = schema.date if schema is not None else "Date"
+                query_params["filter"] = {
+                    "and": [{"property": date_property, "date": condition} for condition in date_conditions]
+                }
 
+            response = self._query(data_source_id, query_params)
             results = response.get("results", [])
 
+            start = to_ordinal(start_date) if start_date else None
+            end = to_ordinal(end_date) if end_date else None
+            query = None
+            if search_query:
+                from meals_mcp.utils.search import normalize_text
+
+                query = normalize_text(search_query)
+
             meals = []
             for page in results:
                 meal = self._map_page_to_meal(page)
                 if not meal:
                     continue
 
-                # Filter in Python
-                if start_date and meal.date < start_date:
+                # Filter in Python, on parsed days
+                if start is not None and meal.ordinal < start:
                     continue
-                if end_date and meal.date > end_date:
+                if end is not None and meal.ordinal > end:
                     continue
-                if search_query and search_query.lower() not in meal.name.lower():
+                if query is not None and query not in normalize_text(meal.name):
                     continue
 
                 meals.append(meal)
@@ -176,7 +340,58 @@ class NotionClient:
             return meals
 
         except Exception as e:
-            print(f"Error fetching meals from Notion API: {e}")
+            print(f"Error fetching meals from Notion API: {e}", file=sys.stderr)
+            raise
+
+    def get_changed_meals(self, since: Optional[str] = None, limit: int = 100) -> List[Meal]:
+        """
+        Retrieves the meals edited at or after `since` (an ISO 8601 timestamp),
+        most recently edited first. Without `since`, returns the last edited
+        meals, up to `limit`.
+
+        Pages are read in `last_edited_time` order, so pagination stops at the
+        first page older than `since`: an unchanged database costs one request.
+        With `since`, every meal edited since is returned whatever `limit`, as
+        callers move their watermark to the newest meal.
+        """
+        try:
+            data_source_id = self._find_data_source_id()
+            query_params = {
+                "page_size": min(limit, 100),
+                "sorts": [
+                    {
+                        "timestamp": "last_edited_time",
+                        "direction": "descending"
+                    }
+                ]
+            }
+            if since:
+                query_params["filter"] = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": since}
+                }
+            watermark = parse_date(since)[1] if since else None
+
+            meals = []
+            while True:
+                response = self._query(data_source_id, query_params)
+                for page in response.get("results", []):
+                    edited = page.get("last_edited_time")
+                    if watermark is not None and edited and parse_date(edited)[1] < watermark:
+                        return meals
+                    meal = self._map_page_to_meal(page)
+                    if meal:
+                        meals.append(meal)
+
+                if not since or not response.get("has_more") or not response.get("next_cursor"):
+                    break
+                query_params["start_cursor"] = response["next_cursor"]
+
+            return meals if since else meals[:limit]
+
+        except Exception as e:
+            # Also reached from background tasks: stdout is reserved for the MCP protocol
+            print(f"Error fetching meal changes from Notion API: {e}", file=sys.stderr)
             raise
 
     def update_meal(self, meal_id: str, updates: dict) -> Optional[Meal]:
@@ -190,20 +405,72 @@ class NotionClient:
                      - date: str (ISO 8601 date string)
                      - heure: str ("Midi" or "Soir")
                      - tags: List[str] (List of tags)
-                     - recipe: str (URL for the recipe)
+                     - recipe: str (URL for the recipe, "" to clear it)
+                     - card: str (Recipe card, in the 'Fiche' text property, "" to clear it)
         
         Returns:
             The updated Meal object, or None if the update failed.
         """
+        schema = self._get_schema()
+        if schema is not None:
+            properties = schema.build_properties(updates)
+        else:
+            properties = self._build_properties(updates)
+
+        if not properties:
+            return None
+
+        try:
+            response = self._client.pages.update(page_id=meal_id, properties=properties)
+            return self._map_page_to_meal(response)
+        except Exception as e:
+            # Also reached from background tasks: stdout is reserved for the MCP protocol
+            print(f"Error updating meal {meal_id}: {e}", file=sys.stderr)
+            raise
+
+    def add_meal(self, meal: Meal) -> Optional[Meal]:
+        """
+        Creates a page for the meal in the 'Repas' database.
+
+        Returns:
+            The created Meal object (with its page ID).
+        """
+        fields = {
+            "name": meal.name,
+            "date": meal.date,
+            "heure": meal.heure,
+            "ingredients": meal.ingredients,
+            "recipe": meal.recipe,
+        }
+        schema = self._get_schema()
+        if schema is not None:
+            properties = schema.build_properties(fields)
+        else:
+            properties = self._build_properties(fields)
+
+        data_source_id = self._find_data_source_id()
+        if hasattr(self._client, "data_sources") and hasattr(self._client.data_sources, "query"):
+            parent = {"type": "data_source_id", "data_source_id": data_source_id}
+        else:
+            parent = {"database_id": data_source_id}
+
+        try:
+            response = self._client.pages.create(parent=parent, properties=properties)
+            return self._map_page_to_meal(response)
+        except Exception as e:
+            print(f"Error adding meal {meal.name}: {e}", file=sys.stderr)
+            raise
+
+    def _build_properties(self, updates: dict) -> dict:
+        """
+        Builds the update payload with the usual property names, when the
+        schema could not be introspected.
+        """
         properties = {}
         
         # Name (Title)
         if "name" in updates and updates["name"]:
-            # We need to find the title property name, defaulting to "Name"
-            # Since we can't easily dynamically find it here without an extra call, 
-            # we'll assume "Name" or try to be smart if possible.
-            # However, for updates, providing the correct property name is crucial.
-            # Let's assume "Name" as per previous observations.
+            # Without the schema, assume "Name" as per previous observations.
             properties["Name"] = {
                 "title": [
                     {
@@ -236,19 +503,16 @@ class NotionClient:
                 "multi_select": [{"name": ingredient} for ingredient in updates["ingredients"]]
             }
 
-        # Recipe (URL) - Maps to 'Lien'
-        if "recipe" in updates: # Allow clearing if None passed explicitly? For now just update if present.
-             if updates["recipe"]:
-                properties["Lien"] = {
-                    "url": updates["recipe"]
-                }
+        # Recipe (URL) - Maps to 'Lien', cleared by an empty string
+        if "recipe" in updates and updates["recipe"] is not None:
+            properties["Lien"] = {
+                "url": updates["recipe"] or None
+            }
 
-        if not properties:
-            return None
+        # Recipe card (Rich text) - Maps to 'Fiche', in chunks of Notion's 2000 characters limit
+        if "card" in updates and updates["card"] is not None:
+            properties["Fiche"] = {
+                "rich_text": [{"text": {"content": updates["card"][i:i + 2000]}} for i in range(0, len(updates["card"]), 2000)]
+            }
 
-        try:
-            response = self._client.pages.update(page_id=meal_id, properties=properties)
-            return self._map_page_to_meal(response)
-        except Exception as e:
-            print(f"Error updating meal {meal_id}: {e}")
-            raise
+        return properties
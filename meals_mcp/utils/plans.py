@@ -0,0 +1,151 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import to_ordinal
+
+# Notion allows an average of three requests per second per integration,
+# with short bursts above that rate
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_BURST = 10
+
+# Requests in flight at the same time when committing a plan
+COMMIT_CONCURRENCY = 4
+
+# Attempts per page when Notion answers that the rate limit is exceeded
+MAX_ATTEMPTS = 4
+RETRY_DELAY_SECONDS = 1.0
+
+# Plan fields and the 'Heure' of the meals they hold
+HEURES = (("midi", "Midi"), ("soir", "Soir"))
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: allows `burst` calls at once, then
+    `rate` calls per second.
+    """
+
+    def __init__(self, rate: float = NOTION_REQUESTS_PER_SECOND, burst: int = NOTION_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token now, possibly going into debt: later callers wait longer
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "code", None) == "rate_limited" or getattr(error, "status", None) == 429
+
+def plan_meals(plans) -> List[Meal]:
+    """
+    Turns plan entries (`Plan` objects or dicts with date, midi and soir)
+    into the meals to write, one per filled slot. A slot planned twice
+    keeps its last meal.
+    """
+    meals: Dict[Tuple[int, str], Meal] = {}
+    for plan in plans:
+        if isinstance(plan, dict):
+            date, fields = plan.get("date"), plan
+        else:
+            date, fields = plan.date, {field: getattr(plan, field, None) for field, _ in HEURES}
+        if not date:
+            raise ValueError("Every planned day must have a date.")
+        date = date[:10]
+        for field, heure in HEURES:
+            name = (fields.get(field) or "").strip()
+            if name:
+                meals[(to_ordinal(date), heure)] = Meal(name=name, date=date, heure=heure)
+    return list(meals.values())
+
+def commit_plan(
+    client,
+    plans,
+    existing: Optional[List[Meal]] = None,
+    limiter: Optional[RateLimiter] = None,
+    concurrency: int = COMMIT_CONCURRENCY,
+    max_attempts: int = MAX_ATTEMPTS,
+    retry_delay: float = RETRY_DELAY_SECONDS,
+) -> dict:
+    """
+    Writes a meal plan to the meals database in one bulk operation.
+
+    Planned meals are matched with the existing pages by (day, heure): a
+    missing meal is created, a different one is renamed (its ingredients,
+    recipe and recipe card are cleared), and an identical one is left
+    alone, so committing the same plan again sends no write. Requests run
+    concurrently under the Notion rate limit and are retried when it is
+    exceeded.
+
+    Returns a dict with the "created", "updated" and "unchanged" meals and
+    the "failed" ones (as {"meal", "error"} dicts).
+    """
+    result = {"created": [], "updated": [], "unchanged": [], "failed": []}
+    wanted = plan_meals(plans)
+    if not wanted:
+        return result
+    limiter = limiter or RateLimiter()
+
+    if existing is None:
+        dates = sorted(meal.date for meal in wanted)
+        limiter.acquire()
+        existing = client.get_meals(limit=100, start_date=dates[0], end_date=dates[-1])
+
+    pages: Dict[Tuple[int, str], Meal] = {}
+    for meal in existing:
+        pages.setdefault((meal.ordinal, meal.heure.casefold()), meal)
+
+    # (kind, planned meal, call) for every write to send
+    writes = []
+    for meal in wanted:
+        page = pages.get((meal.ordinal, meal.heure.casefold()))
+        if page is None:
+            writes.append(("created", meal, lambda meal=meal: client.add_meal(meal)))
+        elif page.name == meal.name:
+            result["unchanged"].append(page)
+        else:
+            updates = {"name": meal.name}
+            if page.ingredients:
+                updates["ingredients"] = []
+            # The recipe and card of the previous dish do not apply to the new one
+            if page.recipe:
+                updates["recipe"] = ""
+            if page.card:
+                updates["card"] = ""
+            writes.append(("updated", meal, lambda page=page, updates=updates: client.update_meal(meal_id=page.id, updates=updates)))
+
+    def send(call):
+        for attempt in range(max_attempts):
+            limiter.acquire()
+            try:
+                return call()
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == max_attempts - 1:
+                    raise
+                time.sleep(retry_delay * 2 ** attempt)
+
+    if not writes:
+        return result
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(writes))), thread_name_prefix="commit-plan") as executor:
+        futures = [(kind, meal, executor.submit(send, call)) for kind, meal, call in writes]
+        for kind, meal, future in futures:
+            try:
+                written = future.result()
+            except Exception as e:
+                result["failed"].append({"meal": meal, "error": str(e)})
+                continue
+            if written is None:
+                result["failed"].append({"meal": meal, "error": "Notion returned no page."})
+            else:
+                result[kind].append(written)
+    return result
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import date as Date
+from typing import Iterable, List, Optional, Tuple
+from meals_mcp.models import Meal
+
+RECENT_URI = "meals://recent"
+WEEK_URI_TEMPLATE = "meals://week/{iso_week}"
+MEAL_URI_TEMPLATE = "meals://meal/{id}"
+
+# Meals listed by the meals://recent resource
+RECENT_LIMIT = 30
+
+def iso_week(day: Date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def week_uri(day: Date) -> str:
+    return WEEK_URI_TEMPLATE.format(iso_week=iso_week(day))
+
+def meal_uri(meal_id: str) -> str:
+    return MEAL_URI_TEMPLATE.format(id=meal_id)
+
+def meal_resource_uris(meal: Meal) -> set:
+    """
+    Returns the URIs of the resources showing a meal.
+    """
+    return {RECENT_URI, week_uri(meal.day), meal_uri(meal.id)}
+
+def parse_uri(uri: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits a meals:// URI into its kind ("recent", "week" or "meal") and argument.
+    Raises ValueError for unknown URIs.
+    """
+    uri = str(uri)
+    if uri == RECENT_URI:
+        return "recent", None
+    for kind in ("week", "meal"):
+        prefix = f"meals://{kind}/"
+        if uri.startswith(prefix) and len(uri) > len(prefix):
+            return kind, uri[len(prefix):]
+    raise ValueError(f"Unknown resource: {uri}")
+
+def week_range(week: str) -> Tuple[str, str]:
+    """
+    Returns the first and last days of an ISO week ('2026-W07').
+    """
+    try:
+        year, number = week.split("-W")
+        start = Date.fromisocalendar(int(year), int(number), 1)
+        end = Date.fromisocalendar(int(year), int(number), 7)
+    except ValueError:
+        raise ValueError(f"Invalid ISO week '{week}'. Expected 'YYYY-Www', e.g. '2026-W07'.")
+    return start.isoformat(), end.isoformat()
+
+def last_modified(meals: Iterable[Meal]) -> Optional[str]:
+    """
+    Returns the most recent `last_edited_time` of the meals, if known.
+    """
+    return max((meal.last_edited_time for meal in meals if meal.last_edited_time), default=None)
+
+def resource_version(meals: List[Meal]) -> str:
+    """
+    Version of a resource, changing whenever one of its meals is edited,
+    added or removed. Built from the content of each meal along with its
+    Notion `last_edited_time`: local edits waiting to be written keep the
+    old edit time, but change the content.
+    """
+    digest = hashlib.sha256()
+    for meal in meals:
+        digest.update(f"{meal.id}\0{meal.model_dump_json()}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def resource_meta(meals: List[Meal]) -> dict:
+    meta = {"version": resource_version(meals)}
+    modified = last_modified(meals)
+    if modified:
+        meta["lastModified"] = modified
+    return meta
+
+def render(value) -> str:
+    """
+    Renders a meal or a list of meals as JSON.
+    """
+    if isinstance(value, Meal):
+        return json.dumps(value.model_dump(exclude_none=True), ensure_ascii=False, indent=2)
+    return json.dumps([meal.model_dump(exclude_none=True) for meal in value], ensure_ascii=False, indent=2)
@@ -0,0 +1,178 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from meals_mcp.models import Meal
+
+# Fields cleared by an empty value ([] or ""); the others skip it
+CLEARABLE = ("ingredients", "recipe", "card")
+
+def _exact(types: Dict[str, str], name: str, property_type: str) -> Optional[str]:
+    """
+    Returns the property if it exists with the expected type.
+    """
+    return name if types.get(name) == property_type else None
+
+def _pick(types: Dict[str, str], preferred: str, property_type: str) -> Optional[str]:
+    """
+    Returns the preferred property if it has the expected type, otherwise
+    the only property of that type, if there is exactly one.
+    """
+    if types.get(preferred) == property_type:
+        return preferred
+    candidates = [name for name, prop_type in types.items() if prop_type == property_type]
+    return candidates[0] if len(candidates) == 1 else None
+
+def _read_title(prop: dict) -> str:
+    title = prop.get("title") or []
+    return title[0].get("plain_text") if title else "Unnamed Meal"
+
+def _read_date(prop: dict) -> Optional[str]:
+    date = prop.get("date")
+    return date.get("start") if date else None
+
+def _read_multi_select(prop: dict) -> List[str]:
+    return [tag.get("name") for tag in prop.get("multi_select") or []]
+
+def _read_select(prop: dict) -> str:
+    select = prop.get("select")
+    return select.get("name") if select else "Unknown"
+
+def _read_rich_text(prop: dict) -> Optional[str]:
+    text = "".join(part.get("plain_text", "") for part in prop.get("rich_text") or [])
+    return text or None
+
+def _read_url(prop: dict) -> Optional[str]:
+    return prop.get("url")
+
+def _read_files(prop: dict) -> Optional[str]:
+    files = prop.get("files") or []
+    if not files:
+        return None
+    first_file = files[0]
+    if "external" in first_file:
+        return first_file.get("external", {}).get("url")
+    if "file" in first_file:
+        return first_file.get("file", {}).get("url")
+    return None
+
+def _write_title(value: str) -> dict:
+    return {"title": [{"text": {"content": value}}]}
+
+def _write_date(value: str) -> dict:
+    return {"date": {"start": value}}
+
+def _write_select(value: str) -> dict:
+    return {"select": {"name": value}}
+
+def _write_multi_select(value: List[str]) -> dict:
+    return {"multi_select": [{"name": item} for item in value]}
+
+def _write_rich_text(value: str) -> dict:
+    # Notion caps each text object at 2000 characters
+    return {"rich_text": [{"text": {"content": value[i:i + 2000]}} for i in range(0, len(value), 2000)]}
+
+def _write_url(value: str) -> dict:
+    return {"url": value or None}
+
+def _write_files(value: str) -> dict:
+    if not value:
+        return {"files": []}
+    return {"files": [{"name": value[:100], "type": "external", "external": {"url": value}}]}
+
+class MealSchema:
+    """
+    Property names and types of the 'Repas' data source, compiled into a
+    page extractor and an update payload builder.
+
+    The schema is introspected once, so mapping a page reads the exact
+    properties instead of probing alternatives, and updates target the
+    real title property on the first request.
+    """
+
+    def __init__(self, properties: dict):
+        types = {name: prop.get("type") for name, prop in properties.items()}
+        # A data source has exactly one title property, whatever its name;
+        # the other fields only map to the properties they are named after,
+        # so an update never writes to an unrelated column
+        self.title = _pick(types, "Name", "title")
+        self.date = _exact(types, "Date", "date")
+        self.ingredients = _exact(types, "Ingredients", "multi_select")
+        self.heure = _exact(types, "Heure", "select")
+        self.recipe_url = _exact(types, "Lien", "url")
+        self.recipe_files = _exact(types, "Recipe", "files")
+        self.card = _exact(types, "Fiche", "rich_text")
+        if self.title is None or self.date is None:
+            raise ValueError("The meals data source must have a title and a date property.")
+
+        self.extract = self._compile_extractor()
+        self._writers = self._compile_writers()
+
+    def _compile_extractor(self) -> Callable[[dict], Optional[Meal]]:
+        # Each field is read by a fixed (property name, reader) pair or has a constant default
+        readers: List[Tuple[str, str, Callable[[dict], object]]] = [
+            ("name", self.title, _read_title),
+            ("date", self.date, _read_date),
+        ]
+        defaults = {"ingredients": [], "heure": "Unknown", "recipe": None}
+        if self.ingredients:
+            readers.append(("ingredients", self.ingredients, _read_multi_select))
+        if self.heure:
+            readers.append(("heure", self.heure, _read_select))
+        if self.card:
+            readers.append(("card", self.card, _read_rich_text))
+        recipe_readers = []
+        if self.recipe_url:
+            recipe_readers.append((self.recipe_url, _read_url))
+        if self.recipe_files:
+            recipe_readers.append((self.recipe_files, _read_files))
+        empty = {}
+
+        def extract(page: dict) -> Optional[Meal]:
+            properties = page.get("properties", empty)
+            fields = dict(defaults)
+            for field, key, reader in readers:
+                prop = properties.get(key)
+                if prop is not None:
+                    fields[field] = reader(prop)
+            if not fields.get("date"):
+                return None
+            fields.setdefault("name", "Unnamed Meal")
+            for key, reader in recipe_readers:
+                prop = properties.get(key)
+                recipe = reader(prop) if prop is not None else None
+                if recipe:
+                    fields["recipe"] = recipe
+                    break
+            return Meal(id=page.get("id"), last_edited_time=page.get("last_edited_time"), **fields)
+
+        return extract
+
+    def _compile_writers(self) -> Dict[str, Tuple[Optional[str], Callable[[object], dict]]]:
+        if self.recipe_url:
+            recipe_writer = (self.recipe_url, _write_url)
+        else:
+            recipe_writer = (self.recipe_files, _write_files)
+        return {
+            "name": (self.title, _write_title),
+            "date": (self.date, _write_date),
+            "heure": (self.heure, _write_select),
+            "ingredients": (self.ingredients, _write_multi_select),
+            "recipe": recipe_writer,
+            "card": (self.card, _write_rich_text),
+        }
+
+    def build_properties(self, updates: dict) -> dict:
+        """
+        Builds the `pages.update` properties payload for the given updates
+        (same keys as NotionClient.update_meal). An empty ingredients list,
+        recipe or card clears the property.
+        """
+        properties = {}
+        for field, value in updates.items():
+            if field not in self._writers:
+                continue
+            if value is None or (field not in CLEARABLE and not value):
+                continue
+            key, writer = self._writers[field]
+            if key is None:
+                raise ValueError(f"The meals data source has no property for '{field}'.")
+            properties[key] = writer(value)
+        return properties
@@ -0,0 +1,171 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, FrozenSet, List, Set, Tuple
+from meals_mcp.models import Meal
+
+# Words ignored in names and queries ("Curry de légumes" ~ "Curry aux légumes")
+STOPWORDS = frozenset({
+    "a", "au", "aux", "avec", "d", "de", "des", "du", "en", "et",
+    "l", "la", "le", "les", "ou", "sur", "un", "une",
+})
+
+# Minimum trigram similarity for a query word to match an indexed word
+MIN_SIMILARITY = 0.6
+
+# Similarity credited to a word matching the start of a longer indexed word
+PREFIX_SIMILARITY = 0.9
+
+# Matches on ingredients rank below matches on the meal name
+INGREDIENT_WEIGHT = 0.8
+
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae"})
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercases, strips accents and punctuation ("Pâtes & Œufs" -> "pates oeufs").
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold().translate(_LIGATURES))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r"[^a-z0-9]+", " ", stripped).strip()
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into normalized words, without stopwords and plural endings.
+    """
+    tokens = []
+    for token in normalize_text(text).split():
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token[-1] in "sx":
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def trigrams(token: str) -> FrozenSet[str]:
+    padded = f" {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+class SearchIndex:
+    """
+    Inverted index over meal names and ingredients.
+
+    Words are normalized (case, accents, plurals) and matched through their
+    character trigrams, so "Pates", "pâte" and "pattes" all find "Pâtes au
+    thon". Results are ranked by relevance, then by recency.
+    """
+
+    def __init__(self, meals: List[Meal] = None):
+        self.meals: Dict[str, Meal] = {}
+        self._fields: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        self._name_postings: Dict[str, Set[str]] = {}
+        self._ingredient_postings: Dict[str, Set[str]] = {}
+        self._trigram_tokens: Dict[str, Set[str]] = {}
+        self._token_trigrams: Dict[str, FrozenSet[str]] = {}
+        for meal in meals or []:
+            self.add(meal)
+
+    def __len__(self) -> int:
+        return len(self.meals)
+
+    def _add_token(self, postings: Dict[str, Set[str]], token: str, meal_id: str) -> None:
+        postings.setdefault(token, set()).add(meal_id)
+        if token not in self._token_trigrams:
+            self._token_trigrams[token] = trigrams(token)
+            for trigram in self._token_trigrams[token]:
+                self._trigram_tokens.setdefault(trigram, set()).add(token)
+
+    def _remove_token(self, postings: Dict[str, Set[str]], token: str, meal_id: str) -> None:
+        posting = postings.get(token)
+        if posting is None:
+            return
+        posting.discard(meal_id)
+        if posting:
+            return
+        del postings[token]
+        if token in self._name_postings or token in self._ingredient_postings:
+            return
+        for trigram in self._token_trigrams.pop(token, ()):
+            tokens = self._trigram_tokens.get(trigram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigram_tokens[trigram]
+
+    def add(self, meal: Meal) -> None:
+        if not meal.id:
+            return
+        if meal.id in self.meals:
+            self.remove(meal.id)
+        name_tokens = set(tokenize(meal.name))
+        ingredient_tokens = {token for ingredient in meal.ingredients for token in tokenize(ingredient)}
+        self.meals[meal.id] = meal
+        self._fields[meal.id] = (name_tokens, ingredient_tokens)
+        for token in name_tokens:
+            self._add_token(self._name_postings, token, meal.id)
+        for token in ingredient_tokens:
+            self._add_token(self._ingredient_postings, token, meal.id)
+
+    def remove(self, meal_id: str) -> None:
+        self.meals.pop(meal_id, None)
+        name_tokens, ingredient_tokens = self._fields.pop(meal_id, (set(), set()))
+        for token in name_tokens:
+            self._remove_token(self._name_postings, token, meal_id)
+        for token in ingredient_tokens:
+            self._remove_token(self._ingredient_postings, token, meal_id)
+
+    def update(self, meal: Meal) -> None:
+        self.add(meal)
+
+    def _similar_tokens(self, token: str) -> Dict[str, float]:
+        """
+        Returns the indexed words matching a query word, with their similarity.
+        """
+        query_trigrams = trigrams(token)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigram_tokens.get(trigram, ()))
+
+        matches = {}
+        for candidate, count in shared.items():
+            candidate_trigrams = self._token_trigrams[candidate]
+            similarity = 2 * count / (len(query_trigrams) + len(candidate_trigrams))
+            if len(token) >= 3 and candidate.startswith(token):
+                similarity = max(similarity, PREFIX_SIMILARITY)
+            if similarity >= MIN_SIMILARITY:
+                matches[candidate] = similarity
+        return matches
+
+    def search(self, query: str, include_ingredients: bool = True) -> List[Tuple[Meal, float]]:
+        """
+        Returns the meals matching every word of the query, as (meal, score)
+        tuples sorted by score then date, most relevant and recent first.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        scores: Dict[str, float] = {}
+        for i, query_token in enumerate(query_tokens):
+            token_scores: Dict[str, float] = {}
+            for token, similarity in self._similar_tokens(query_token).items():
+                for meal_id in self._name_postings.get(token, ()):
+                    token_scores[meal_id] = max(token_scores.get(meal_id, 0.0), similarity)
+                if include_ingredients:
+                    for meal_id in self._ingredient_postings.get(token, ()):
+                        token_scores[meal_id] = max(token_scores.get(meal_id, 0.0), similarity * INGREDIENT_WEIGHT)
+
+            if i == 0:
+                scores = token_scores
+            else:
+                scores = {
+                    meal_id: score + token_scores[meal_id]
+                    for meal_id, score in scores.items()
+                    if meal_id in token_scores
+                }
+            if not scores:
+                return []
+
+        results = [(self.meals[meal_id], score / len(query_tokens)) for meal_id, score in scores.items()]
+        results.sort(key=lambda item: (round(item[1], 3), item[0].timestamp), reverse=True)
+        return results
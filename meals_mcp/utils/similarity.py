@@ -0,0 +1,114 @@
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from meals_mcp.models import Meal
+from meals_mcp.utils.stats import normalize_ingredient
+
+def ingredient_vector(ingredients: Iterable[str]) -> Set[str]:
+    """
+    Returns the binary ingredient vector of a meal as a set of normalized tags.
+    """
+    return {key for key in (normalize_ingredient(ingredient) for ingredient in ingredients) if key}
+
+class SimilarityIndex:
+    """
+    Inverted index over meal ingredient vectors for cosine top-k queries.
+
+    Only the posting lists of the query's ingredients are visited, so a
+    query touches the meals sharing at least one ingredient with it rather
+    than the whole history. Meals can be added, updated or removed in place.
+    """
+
+    def __init__(self, meals: List[Meal] = None):
+        self.meals: Dict[str, Meal] = {}
+        self._vectors: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        for meal in meals or []:
+            self.add(meal)
+
+    def __len__(self) -> int:
+        return len(self.meals)
+
+    def add(self, meal: Meal) -> None:
+        if not meal.id:
+            return
+        if meal.id in self.meals:
+            self.remove(meal.id)
+        vector = ingredient_vector(meal.ingredients)
+        self.meals[meal.id] = meal
+        self._vectors[meal.id] = vector
+        for key in vector:
+            self._postings.setdefault(key, set()).add(meal.id)
+
+    def remove(self, meal_id: str) -> None:
+        self.meals.pop(meal_id, None)
+        for key in self._vectors.pop(meal_id, set()):
+            posting = self._postings.get(key)
+            if posting is not None:
+                posting.discard(meal_id)
+                if not posting:
+                    del self._postings[key]
+
+    def update(self, meal: Meal) -> None:
+        self.add(meal)
+
+    def find(self, meal_id: str = None, name: str = None) -> Optional[Meal]:
+        """
+        Finds the reference meal by ID, or by name (exact match first, then
+        the most recent meal whose name contains the query).
+        """
+        if meal_id:
+            return self.meals.get(meal_id)
+        if not name:
+            return None
+        query = name.strip().casefold()
+        exact, partial = None, None
+        for meal in self.meals.values():
+            meal_name = meal.name.casefold()
+            if meal_name == query and (exact is None or meal.timestamp > exact.timestamp):
+                exact = meal
+            elif query in meal_name and (partial is None or meal.timestamp > partial.timestamp):
+                partial = meal
+        return exact or partial
+
+    def similar(self, meal: Meal, k: int = 5, exclude_ingredients: Iterable[str] = ()) -> List[Tuple[Meal, float, List[str]]]:
+        """
+        Returns up to `k` distinct meals most similar to `meal`, as
+        (meal, cosine score, shared ingredients) tuples.
+
+        Meals containing any of `exclude_ingredients` are skipped and those
+        ingredients are dropped from the query vector. Repeated occurrences of
+        the same dish are collapsed into their most recent entry.
+        """
+        excluded = ingredient_vector(exclude_ingredients)
+        query = ingredient_vector(meal.ingredients) - excluded
+        if not query:
+            return []
+
+        overlaps: Dict[str, int] = {}
+        for key in query:
+            for candidate_id in self._postings.get(key, ()):
+                overlaps[candidate_id] = overlaps.get(candidate_id, 0) + 1
+
+        reference_name = meal.name.casefold()
+        best: Dict[str, Tuple[float, str, str]] = {}
+        for candidate_id, overlap in overlaps.items():
+            candidate = self.meals[candidate_id]
+            candidate_name = candidate.name.casefold()
+            if candidate_id == meal.id or candidate_name == reference_name:
+                continue
+            vector = self._vectors[candidate_id]
+            if excluded and not excluded.isdisjoint(vector):
+                continue
+            score = overlap / math.sqrt(len(query) * len(vector))
+            previous = best.get(candidate_name)
+            if previous is None or (score, candidate.timestamp) > previous[:2]:
+                best[candidate_name] = (score, candidate.timestamp, candidate_id)
+
+        top = heapq.nlargest(k, best.values())
+        results = []
+        for score, _, candidate_id in top:
+            candidate = self.meals[candidate_id]
+            shared = [ingredient for ingredient in candidate.ingredients if normalize_ingredient(ingredient) in query]
+            results.append((candidate, score, shared))
+        return results
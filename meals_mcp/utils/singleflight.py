@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is in flight wait for its result (or exception)
+    instead of running it again. Results are shared, so callers must treat
+    them as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.executions = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.executions += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    @property
+    def coalesced(self) -> int:
+        return self.calls - self.executions
+
+    def stats(self) -> dict:
+        """
+        Returns the number of calls, executions and coalesced calls, and the
+        share of calls that were served by another caller's execution.
+        """
+        with self._lock:
+            calls, executions = self.calls, self.executions
+        return {
+            "calls": calls,
+            "executions": executions,
+            "coalesced": calls - executions,
+            "coalescing_rate": (calls - executions) / calls if calls else 0.0,
+        }
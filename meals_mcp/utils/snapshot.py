@@ -0,0 +1,243 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date as Date
+from typing import Dict, Iterator, List, Optional
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import to_ordinal
+from meals_mcp.utils.search import normalize_text
+
+# Environment variable pointing consumers to a snapshot instead of Notion
+SNAPSHOT_ENV = "MEALS_SNAPSHOT"
+
+MAGIC = b"MEALSNP1"
+FORMAT_VERSION = 2
+
+# Header: magic, format version, number of meals, number of sections
+_HEADER = struct.Struct("<8sIII")
+# Section table entry: name, offset, length in bytes
+_SECTION = struct.Struct("<32sQQ")
+
+# Columns of 4-byte integers, one entry per meal (ingredient_offsets has one
+# more, ingredients one per tag). String dictionaries are stored as a count,
+# an offsets column and the UTF-8 blob of all strings.
+_INT_COLUMNS = ("ids", "dates", "date_suffixes", "names", "heures", "recipes", "sources", "ingredient_offsets", "ingredients")
+_STRING_TABLES = ("id_strings", "date_suffix_strings", "name_strings", "heure_strings", "recipe_strings", "source_strings", "ingredient_strings")
+
+class _Interner:
+    """Assigns consecutive indices to distinct strings."""
+
+    def __init__(self):
+        self.indices: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def __call__(self, value: str) -> int:
+        index = self.indices.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.indices[value] = index
+            self.strings.append(value)
+        return index
+
+def _encode_strings(strings: List[str]) -> bytes:
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = array("I", [len(encoded), 0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return offsets.tobytes() + b"".join(encoded)
+
+def write_snapshot(meals: List[Meal], path: str) -> int:
+    """
+    Writes meals to a columnar snapshot file and returns its size in bytes.
+
+    Dates are stored as ordinal days (plus an interned suffix for times and
+    timezones); ids, names, heures, recipes and ingredients as indices into
+    interned string dictionaries; ingredient lists as an offsets column into
+    a flat column of ingredient indices.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("Meal snapshots are only supported on little-endian platforms.")
+
+    interners = {name: _Interner() for name in _STRING_TABLES}
+    columns = {name: array("i") for name in _INT_COLUMNS}
+    columns["ingredient_offsets"].append(0)
+
+    for meal in meals:
+        columns["ids"].append(interners["id_strings"](meal.id or ""))
+        columns["dates"].append(meal.ordinal)
+        columns["date_suffixes"].append(interners["date_suffix_strings"](meal.date[10:]))
+        columns["names"].append(interners["name_strings"](meal.name))
+        columns["heures"].append(interners["heure_strings"](meal.heure))
+        columns["recipes"].append(interners["recipe_strings"](meal.recipe) if meal.recipe else -1)
+        columns["sources"].append(interners["source_strings"](meal.source) if meal.source else -1)
+        for ingredient in meal.ingredients:
+            columns["ingredients"].append(interners["ingredient_strings"](ingredient))
+        columns["ingredient_offsets"].append(len(columns["ingredients"]))
+
+    sections = [(name, columns[name].tobytes()) for name in _INT_COLUMNS]
+    sections += [(name, _encode_strings(interners[name].strings)) for name in _STRING_TABLES]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table, payload = [], []
+    for name, data in sections:
+        # Keep every section 4-byte aligned so it can be cast in place
+        padding = -len(data) % 4
+        table.append(_SECTION.pack(name.encode(), offset, len(data)))
+        payload.append(data + b"\0" * padding)
+        offset += len(data) + padding
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(meals), len(sections)))
+        f.write(b"".join(table))
+        f.write(b"".join(payload))
+    os.replace(tmp_path, path)
+    return offset
+
+class _StringTable:
+    """Interned strings decoded on demand from a memory-mapped dictionary."""
+
+    def __init__(self, data: memoryview):
+        count = data[:4].cast("I")[0]
+        self._offsets = data[4:8 + 4 * count].cast("I")
+        self._blob = data[8 + 4 * count:]
+        self._cache: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        value = self._cache.get(index)
+        if value is None:
+            value = bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8")
+            self._cache[index] = value
+        return value
+
+class MealSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Opening a snapshot only maps the file: columns are read in place and
+    meals are decoded one at a time when accessed.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise RuntimeError("Meal snapshots are only supported on little-endian platforms.")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, count, section_count = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a meal snapshot (format version {FORMAT_VERSION}).")
+        self._count = count
+
+        sections = {}
+        for i in range(section_count):
+            name, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            sections[name.rstrip(b"\0").decode()] = view[offset:offset + length]
+
+        self.ids = _StringTable(sections["id_strings"])
+        self.date_suffixes = _StringTable(sections["date_suffix_strings"])
+        self.names = _StringTable(sections["name_strings"])
+        self.heures = _StringTable(sections["heure_strings"])
+        self.recipes = _StringTable(sections["recipe_strings"])
+        self.sources = _StringTable(sections["source_strings"])
+        self.ingredients = _StringTable(sections["ingredient_strings"])
+        self.columns: Dict[str, memoryview] = {name: sections[name].cast("i") for name in _INT_COLUMNS}
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def ordinals(self) -> memoryview:
+        """Dates of the meals as ordinal days (`date.toordinal()`)."""
+        return self.columns["dates"]
+
+    def date(self, row: int) -> str:
+        day = Date.fromordinal(self.columns["dates"][row]).isoformat()
+        return day + self.date_suffixes[self.columns["date_suffixes"][row]]
+
+    def ingredient_ids(self, row: int) -> memoryview:
+        offsets = self.columns["ingredient_offsets"]
+        return self.columns["ingredients"][offsets[row]:offsets[row + 1]]
+
+    def __getitem__(self, row: int) -> Meal:
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        recipe = self.columns["recipes"][row]
+        source = self.columns["sources"][row]
+        return Meal(
+            id=self.ids[self.columns["ids"][row]] or None,
+            name=self.names[self.columns["names"][row]],
+            date=self.date(row),
+            ingredients=[self.ingredients[ingredient] for ingredient in self.ingredient_ids(row)],
+            heure=self.heures[self.columns["heures"][row]],
+            recipe=self.recipes[recipe] if recipe >= 0 else None,
+            source=self.sources[source] if source >= 0 else None,
+        )
+
+    def __iter__(self) -> Iterator[Meal]:
+        for row in range(self._count):
+            yield self[row]
+
+    def close(self) -> None:
+        # Release the views before the map itself
+        self.columns = {}
+        self.ids = self.date_suffixes = self.names = self.heures = self.recipes = self.sources = self.ingredients = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A view is still referenced elsewhere: the map is released with it
+            pass
+
+class SnapshotClient:
+    """
+    Read-only meals backend serving a snapshot file with the same read
+    methods as NotionClient.
+    """
+
+    def __init__(self, path: str):
+        self.snapshot = MealSnapshot(path)
+
+    def close(self):
+        self.snapshot.close()
+
+    def get_users(self):
+        return []
+
+    def get_all_meals(self) -> List[Meal]:
+        return list(self.snapshot)
+
+    def get_meals(self, limit: int = 30, start_date: str = None, end_date: str = None, search_query: str = None) -> List[Meal]:
+        start = to_ordinal(start_date) if start_date else None
+        end = to_ordinal(end_date) if end_date else None
+        query = normalize_text(search_query) if search_query else None
+
+        meals = []
+        ordinals = self.snapshot.ordinals
+        for row in range(len(self.snapshot)):
+            if start is not None and ordinals[row] < start:
+                continue
+            if end is not None and ordinals[row] > end:
+                continue
+            if query and query not in normalize_text(self.snapshot.names[self.snapshot.columns["names"][row]]):
+                continue
+            meals.append(self.snapshot[row])
+            if len(meals) >= limit:
+                break
+        return meals
+
+    def get_changed_meals(self, since: str = None, limit: int = 100) -> List[Meal]:
+        # A snapshot never changes
+        return []
+
+    def update_meal(self, meal_id: str, updates: dict) -> Optional[Meal]:
+        raise PermissionError(f"Meal snapshot {self.snapshot.path} is read-only.")
+
+    def add_meal(self, meal: Meal) -> Optional[Meal]:
+        raise PermissionError(f"Meal snapshot {self.snapshot.path} is read-only.")
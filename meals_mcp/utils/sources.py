@@ -0,0 +1,125 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, List, Optional
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import date_key, parse_date
+
+# Environment variable listing the meal sources, e.g.
+# "home=NOTION_TOKEN_HOME,grandparents=NOTION_TOKEN_GRANDPARENTS": each source
+# name is mapped to the environment variable holding its Notion token.
+SOURCES_ENV = "MEALS_SOURCES"
+
+def parse_sources(spec: str) -> Dict[str, str]:
+    """
+    Parses a MEALS_SOURCES value into a {source name: token variable} dict.
+    """
+    sources = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, token_env = item.partition("=")
+        if not name.strip() or not token_env.strip():
+            raise ValueError(f"Invalid meal source '{item}'. Expected 'name=TOKEN_ENV_VAR'.")
+        sources[name.strip()] = token_env.strip()
+    if not sources:
+        raise ValueError(f"{SOURCES_ENV} does not define any meal source.")
+    return sources
+
+class MultiSourceClient:
+    """
+    Meals backend querying several meal databases at once.
+
+    Reads are sent to every source concurrently; the date-sorted results are
+    merged with a k-way heap merge that stops at the requested limit, and
+    each meal is tagged with the name of its source. Updates are routed to
+    the source the meal was read from, new meals to their own source or
+    the first one listed.
+    """
+
+    def __init__(self, clients: Dict[str, object]):
+        self.clients = clients
+        self._executor = ThreadPoolExecutor(max_workers=len(clients), thread_name_prefix="meal-source")
+        self._meal_sources: Dict[str, str] = {}
+
+    @classmethod
+    def from_env(cls, client_class, spec: str = None) -> "MultiSourceClient":
+        """
+        Builds one `client_class(auth_token)` per source listed in MEALS_SOURCES.
+        """
+        sources = parse_sources(spec if spec is not None else os.environ.get(SOURCES_ENV, ""))
+        clients = {}
+        for name, token_env in sources.items():
+            token = os.environ.get(token_env)
+            if not token:
+                raise ValueError(f"Notion API token for meal source '{name}' ({token_env}) not found.")
+            clients[name] = client_class(auth_token=token)
+        return cls(clients)
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+        self._executor.shutdown(wait=False)
+
+    def _fan_out(self, method: str, *args, **kwargs) -> Dict[str, List[Meal]]:
+        futures = {
+            name: self._executor.submit(getattr(client, method), *args, **kwargs)
+            for name, client in self.clients.items()
+        }
+        results = {}
+        for name, future in futures.items():
+            results[name] = [meal.model_copy(update={"source": name}) for meal in future.result()]
+            for meal in results[name]:
+                if meal.id:
+                    self._meal_sources[meal.id] = name
+        return results
+
+    @staticmethod
+    def _merge(streams: List[List[Meal]], limit: Optional[int] = None) -> List[Meal]:
+        merged = heapq.merge(*streams, key=date_key, reverse=True)
+        return list(islice(merged, limit))
+
+    def get_users(self):
+        users = []
+        for client in self.clients.values():
+            users.extend(client.get_users())
+        return users
+
+    def get_all_meals(self) -> List[Meal]:
+        return self._merge(list(self._fan_out("get_all_meals").values()))
+
+    def get_meals(self, limit: int = 30, start_date: str = None, end_date: str = None, search_query: str = None) -> List[Meal]:
+        # No source contributes more than `limit` meals to the merged result
+        streams = self._fan_out("get_meals", limit=limit, start_date=start_date, end_date=end_date, search_query=search_query)
+        return self._merge(list(streams.values()), limit)
+
+    def get_changed_meals(self, since: str = None, limit: int = 100) -> List[Meal]:
+        streams = self._fan_out("get_changed_meals", since=since, limit=limit)
+        meals = [meal for stream in streams.values() for meal in stream]
+        return sorted(meals, key=lambda meal: parse_date(meal.last_edited_time)[1] if meal.last_edited_time else 0.0, reverse=True)
+
+    def update_meal(self, meal_id: str, updates: dict) -> Optional[Meal]:
+        source = self._meal_sources.get(meal_id)
+        candidates = [source] if source else list(self.clients)
+        error = None
+        for name in candidates:
+            try:
+                meal = self.clients[name].update_meal(meal_id=meal_id, updates=updates)
+            except Exception as e:
+                # The page belongs to another source (or the update failed): try the next one
+                error = e
+                continue
+            self._meal_sources[meal_id] = name
+            return meal.model_copy(update={"source": name}) if meal else None
+        raise error
+
+    def add_meal(self, meal: Meal) -> Optional[Meal]:
+        # New meals go to their own source, or to the first one listed
+        name = meal.source if meal.source in self.clients else next(iter(self.clients))
+        created = self.clients[name].add_meal(meal)
+        if created is None:
+            return None
+        if created.id:
+            self._meal_sources[created.id] = name
+        return created.model_copy(update={"source": name})
@@ -0,0 +1,86 @@
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import List, Tuple
+
+SERVER_MODULE = "meals_mcp.server"
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "meals-mcp-startup-profiler", "version": "0"},
+    },
+}
+
+def import_times(module: str = SERVER_MODULE) -> List[Tuple[str, int, int]]:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime` and returns
+    (module, self us, cumulative us) for every module it loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        times.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return times
+
+def time_to_initialize(module: str = SERVER_MODULE) -> float:
+    """
+    Starts the stdio server in a fresh process and returns the number of
+    seconds until it answers an `initialize` request.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", module],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        process.stdin.write(json.dumps(INITIALIZE_REQUEST) + "\n")
+        process.stdin.flush()
+        response = process.stdout.readline()
+        elapsed = time.perf_counter() - start
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    if not response:
+        raise RuntimeError(f"{module} exited without answering the initialize request.")
+    return elapsed
+
+def startup_report(module: str = SERVER_MODULE, top: int = 15) -> str:
+    """
+    Builds a text report of import time per top-level package and the time
+    to the first `initialize` response.
+    """
+    times = import_times(module)
+    packages = defaultdict(int)
+    for name, self_us, _ in times:
+        packages[name.split(".")[0]] += self_us
+    total_us = sum(packages.values())
+
+    report = f"Import time for {module}: {total_us / 1000:.1f} ms\n\n"
+    report += "Top packages (self time):\n"
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        report += f"- {package}: {self_us / 1000:.1f} ms ({self_us * 100 // max(total_us, 1)}%)\n"
+    report += f"\nTime to initialize response: {time_to_initialize(module) * 1000:.0f} ms\n"
+    return report
@@ -0,0 +1,139 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date as Date
+from typing import Dict, List, Optional, Tuple
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import date_key, to_ordinal
+
+PERIODS = ("week", "month", "quarter", "year")
+
+def normalize_ingredient(ingredient: str) -> str:
+    """
+    Normalizes an ingredient tag for case-insensitive lookups.
+    """
+    return ingredient.strip().casefold()
+
+def period_key(day: str, period: str) -> str:
+    """
+    Returns the bucket label of a 'YYYY-MM-DD' day for the given period.
+    """
+    if period == "year":
+        return day[:4]
+    if period == "month":
+        return day[:7]
+    if period == "quarter":
+        return f"{day[:4]}-Q{(int(day[5:7]) - 1) // 3 + 1}"
+    if period == "week":
+        year, week, _ = Date.fromisoformat(day).isocalendar()
+        return f"{year}-W{week:02d}"
+    raise ValueError(f"Unknown period '{period}'. Expected one of: {', '.join(PERIODS)}.")
+
+class MealStats:
+    """
+    Sparse meal x ingredient incidence matrix built from a meal history.
+
+    Meals are stored as rows sorted by date (oldest first) and each ingredient
+    column keeps the sorted list of rows it appears in, so counting within a
+    date range is two bisections per column instead of a scan of the history.
+    """
+
+    def __init__(self, meals: List[Meal]):
+        meals = sorted(meals, key=date_key)
+        self.ordinals: List[int] = [meal.ordinal for meal in meals]
+        self.days: List[str] = [meal.day.isoformat() for meal in meals]
+        self.ingredients: List[str] = []
+        self._column_ids: Dict[str, int] = {}
+        self.rows: List[List[int]] = []
+        self.columns: List[List[int]] = []
+
+        for row, meal in enumerate(meals):
+            meal_columns = []
+            for ingredient in meal.ingredients:
+                key = normalize_ingredient(ingredient)
+                if not key:
+                    continue
+                column = self._column_ids.get(key)
+                if column is None:
+                    column = len(self.ingredients)
+                    self._column_ids[key] = column
+                    self.ingredients.append("")
+                    self.columns.append([])
+                if column in meal_columns:
+                    continue
+                # Display the most recent spelling of the tag
+                self.ingredients[column] = ingredient.strip()
+                meal_columns.append(column)
+                self.columns[column].append(row)
+            self.rows.append(meal_columns)
+
+    def column(self, ingredient: str) -> Optional[int]:
+        return self._column_ids.get(normalize_ingredient(ingredient))
+
+    def row_range(self, start_date: str = None, end_date: str = None) -> Tuple[int, int]:
+        """
+        Returns the [lo, hi) row bounds of the meals within the date range.
+        """
+        lo = bisect_left(self.ordinals, to_ordinal(start_date)) if start_date else 0
+        hi = bisect_right(self.ordinals, to_ordinal(end_date)) if end_date else len(self.ordinals)
+        return lo, max(lo, hi)
+
+    def _column_slice(self, column: int, lo: int, hi: int) -> List[int]:
+        rows = self.columns[column]
+        return rows[bisect_left(rows, lo):bisect_left(rows, hi)]
+
+    def total(self, start_date: str = None, end_date: str = None) -> int:
+        lo, hi = self.row_range(start_date, end_date)
+        return hi - lo
+
+    def count(self, ingredient: str, start_date: str = None, end_date: str = None) -> int:
+        column = self.column(ingredient)
+        if column is None:
+            return 0
+        lo, hi = self.row_range(start_date, end_date)
+        return len(self._column_slice(column, lo, hi))
+
+    def last_seen(self, ingredient: str, end_date: str = None) -> Optional[str]:
+        column = self.column(ingredient)
+        if column is None:
+            return None
+        _, hi = self.row_range(None, end_date)
+        rows = self._column_slice(column, 0, hi)
+        return self.days[rows[-1]] if rows else None
+
+    def top_ingredients(self, n: int = 10, start_date: str = None, end_date: str = None) -> List[Tuple[str, int, str]]:
+        """
+        Returns the `n` most frequent ingredients as (name, count, last seen) tuples.
+        """
+        lo, hi = self.row_range(start_date, end_date)
+        counts = []
+        for column, name in enumerate(self.ingredients):
+            rows = self._column_slice(column, lo, hi)
+            if rows:
+                counts.append((name, len(rows), self.days[rows[-1]]))
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return counts[:n]
+
+    def frequency(self, ingredient: str, period: str = "month", start_date: str = None, end_date: str = None) -> List[Tuple[str, int]]:
+        """
+        Returns the number of meals containing the ingredient per period, oldest first.
+        """
+        column = self.column(ingredient)
+        if column is None:
+            return []
+        lo, hi = self.row_range(start_date, end_date)
+        buckets = Counter(period_key(self.days[row], period) for row in self._column_slice(column, lo, hi))
+        return sorted(buckets.items())
+
+    def cooccurrence(self, ingredient: str, n: int = 10, start_date: str = None, end_date: str = None) -> List[Tuple[str, int]]:
+        """
+        Returns the ingredients most often cooked together with the given one.
+        """
+        column = self.column(ingredient)
+        if column is None:
+            return []
+        lo, hi = self.row_range(start_date, end_date)
+        pairs = Counter()
+        for row in self._column_slice(column, lo, hi):
+            pairs.update(other for other in self.rows[row] if other != column)
+        ranked = sorted(pairs.items(), key=lambda item: (-item[1], self.ingredients[item[0]]))
+        return [(self.ingredients[other], count) for other, count in ranked[:n]]
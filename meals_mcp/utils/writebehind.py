@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from meals_mcp.models import Meal
+
+# Seconds between two flushes; edits made within this window are merged
+FLUSH_INTERVAL_SECONDS = 0.5
+
+# Attempts before a write is reported as failed
+MAX_ATTEMPTS = 5
+
+class WriteBehindQueue:
+    """
+    Durable write-behind queue for meal updates.
+
+    Updates are appended to a local JSON-lines journal and applied at once to
+    the local meal history, then sent to Notion by a background flusher that
+    merges all pending edits of a page into one request and retries failures
+    with exponential backoff. Pending updates survive restarts: the journal
+    is replayed when the queue is created.
+    """
+
+    def __init__(self, client, journal_path: str, history=None, flush_interval: float = FLUSH_INTERVAL_SECONDS, max_attempts: int = MAX_ATTEMPTS):
+        self.client = client
+        self.journal_path = journal_path
+        self.history = history
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._seq = 0
+        # seq -> {"meal_id", "updates"} in submission order
+        self._pending: Dict[int, dict] = {}
+        # seq -> {"meal_id", "updates", "error"}
+        self._failed: Dict[int, dict] = {}
+        # meal_id -> (attempts, monotonic time of the next attempt)
+        self._retries: Dict[str, tuple] = {}
+        self._replay()
+        if history is not None:
+            history.overlay = self.apply_pending
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record["op"] == "update":
+                    self._seq = max(self._seq, record["seq"])
+                    self._pending[record["seq"]] = {"meal_id": record["meal_id"], "updates": record["updates"]}
+                elif record["op"] == "done":
+                    for seq in record["seqs"]:
+                        self._pending.pop(seq, None)
+                        self._failed.pop(seq, None)
+                elif record["op"] == "failed":
+                    for seq in record["seqs"]:
+                        entry = self._pending.pop(seq, None)
+                        if entry is not None:
+                            self._failed[seq] = dict(entry, error=record["error"])
+
+    def _append(self, records: List[dict]) -> None:
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact(self) -> None:
+        """
+        Rewrites the journal with only the pending and failed writes.
+        """
+        records = []
+        for seq, entry in self._pending.items():
+            records.append({"op": "update", "seq": seq, "meal_id": entry["meal_id"], "updates": entry["updates"]})
+        for seq, entry in self._failed.items():
+            records.append({"op": "update", "seq": seq, "meal_id": entry["meal_id"], "updates": entry["updates"]})
+            records.append({"op": "failed", "seqs": [seq], "error": entry["error"]})
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.journal_path)
+
+    @staticmethod
+    def _apply(meal: Meal, updates: dict) -> Meal:
+        changes = {key: value for key, value in updates.items() if key in Meal.model_fields}
+        return meal.model_copy(update=changes)
+
+    def apply_pending(self, meals: List[Meal]) -> List[Meal]:
+        """
+        Returns the meals with the pending updates applied, so reads see local edits.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+        if not pending:
+            return meals
+        updated = []
+        for meal in meals:
+            for entry in pending:
+                if entry["meal_id"] == meal.id:
+                    meal = self._apply(meal, entry["updates"])
+            updated.append(meal)
+        return updated
+
+    def submit(self, meal_id: str, updates: dict) -> Optional[Meal]:
+        """
+        Records an update in the journal and applies it to the local history.
+
+        Returns the locally updated meal, or None if the meal is not in the
+        local history (the update is queued all the same).
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._append([{"op": "update", "seq": seq, "meal_id": meal_id, "updates": updates}])
+            self._pending[seq] = {"meal_id": meal_id, "updates": updates}
+
+        if self.history is None:
+            return None
+        current = next((meal for meal in self.history.meals if meal.id == meal_id), None)
+        if current is None:
+            return None
+        updated = self._apply(current, updates)
+        self.history.apply_update(updated)
+        return updated
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Sends the pending updates that are due, one merged request per page.
+        Returns the number of pages written.
+        """
+        now = time.monotonic()
+        with self._lock:
+            batches: Dict[str, List[int]] = {}
+            for seq, entry in self._pending.items():
+                attempts, next_attempt = self._retries.get(entry["meal_id"], (0, 0.0))
+                if force or next_attempt <= now:
+                    batches.setdefault(entry["meal_id"], []).append(seq)
+            batches = {
+                meal_id: [(seq, self._pending[seq]["updates"]) for seq in seqs]
+                for meal_id, seqs in batches.items()
+            }
+
+        written = 0
+        for meal_id, entries in batches.items():
+            seqs = [seq for seq, _ in entries]
+            merged = {}
+            for _, updates in entries:
+                merged.update(updates)
+            try:
+                self.client.update_meal(meal_id=meal_id, updates=merged)
+            except Exception as e:
+                self._record_failure(meal_id, seqs, str(e))
+                continue
+            with self._lock:
+                # A later write to the page supersedes the failed ones whose
+                # fields it all wrote again
+                superseded = [
+                    seq for seq, entry in self._failed.items()
+                    if entry["meal_id"] == meal_id and set(entry["updates"]) <= set(merged)
+                ]
+                self._append([{"op": "done", "seqs": seqs + superseded}])
+                for seq in seqs:
+                    self._pending.pop(seq, None)
+                for seq in superseded:
+                    del self._failed[seq]
+                self._retries.pop(meal_id, None)
+            written += 1
+
+        if written:
+            with self._lock:
+                self._compact()
+        return written
+
+    def discard_failed(self, meal_id: Optional[str] = None) -> int:
+        """
+        Forgets the failed writes (of one page, or all of them).
+        Returns the number of writes discarded.
+        """
+        with self._lock:
+            seqs = [seq for seq, entry in self._failed.items() if meal_id is None or entry["meal_id"] == meal_id]
+            if not seqs:
+                return 0
+            for seq in seqs:
+                del self._failed[seq]
+            self._compact()
+        return len(seqs)
+
+    def _record_failure(self, meal_id: str, seqs: List[int], error: str) -> None:
+        with self._lock:
+            attempts, _ = self._retries.get(meal_id, (0, 0.0))
+            attempts += 1
+            if attempts < self.max_attempts:
+                delay = self.flush_interval * 2 ** attempts
+                self._retries[meal_id] = (attempts, time.monotonic() + delay)
+                return
+            self._append([{"op": "failed", "seqs": seqs, "error": error}])
+            for seq in seqs:
+                entry = self._pending.pop(seq, None)
+                if entry is not None:
+                    self._failed[seq] = dict(entry, error=error)
+            self._retries.pop(meal_id, None)
+        if self.history is not None:
+            # The optimistic local state is wrong: fetch the truth again
+            self.history.invalidate()
+
+    def status(self) -> dict:
+        """
+        Returns the pending and failed writes.
+        """
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "pending_pages": len({entry["meal_id"] for entry in self._pending.values()}),
+                "failed": [
+                    {"meal_id": entry["meal_id"], "updates": entry["updates"], "error": entry["error"]}
+                    for entry in self._failed.values()
+                ],
+            }
+
+    async def run(self) -> None:
+        """
+        Flushes pending updates in the background until cancelled.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await asyncio.to_thread(self.flush)
+        finally:
+            # Best effort to send what is pending before exiting
+            await asyncio.shield(asyncio.to_thread(self.flush, True))
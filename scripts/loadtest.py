@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as Date, timedelta
+from typing import Dict, List, Optional
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from meals_mcp.models import Meal
+
+# Mix of operations issued by each simulated session (relative weights)
+DEFAULT_MIX = {
+    "list_tools": 2,
+    "get_recent_meals": 3,
+    "get_recent_meals_days": 2,
+    "get_recent_meals_search": 1,
+    "update_meal": 2,
+}
+
+# Interval of the event-loop lag probe
+LAG_PROBE_INTERVAL_SECONDS = 0.01
+
+INGREDIENTS = ["poulet", "riz", "tomate", "pâtes", "oeufs", "courgette", "lardon", "pomme de terre", "poireau", "thon"]
+DISHES = ["Wok", "Gratin", "Curry", "Omelette", "Soupe", "Tarte", "Salade", "Lasagnes", "Risotto", "Quiche"]
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile of `values` (0 if empty).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def fake_meals(count: int = 500, seed: int = 0) -> List[Meal]:
+    """
+    Generates a meal history of `count` meals, two per day, most recent first.
+    """
+    rng = random.Random(seed)
+    today = Date.today()
+    meals = []
+    for i in range(count):
+        day = today - timedelta(days=i // 2)
+        meals.append(Meal(
+            id=f"meal-{i}",
+            name=f"{rng.choice(DISHES)} {rng.choice(INGREDIENTS)}",
+            date=day.isoformat(),
+            heure="Soir" if i % 2 == 0 else "Midi",
+            ingredients=rng.sample(INGREDIENTS, 3),
+        ))
+    return meals
+
+class FakeNotionClient:
+    """
+    In-memory meals backend with the methods of NotionClient, sleeping
+    `latency` seconds (plus up to `jitter`) in every call to mimic the
+    blocking Notion API.
+    """
+
+    def __init__(self, meals: List[Meal], latency: float = 0.1, jitter: float = 0.05, seed: int = 0):
+        self.meals = list(meals)
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _wait(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+    def get_users(self):
+        self._wait()
+        return []
+
+    def get_all_meals(self) -> List[Meal]:
+        self._wait()
+        with self._lock:
+            return list(self.meals)
+
+    def get_meals(self, limit: int = 30, start_date: str = None, end_date: str = None, search_query: str = None) -> List[Meal]:
+        self._wait()
+        with self._lock:
+            return self.meals[:limit]
+
+    def update_meal(self, meal_id: str, updates: dict) -> Optional[Meal]:
+        self._wait()
+        with self._lock:
+            for i, meal in enumerate(self.meals):
+                if meal.id == meal_id:
+                    changes = {key: value for key, value in updates.items() if key in Meal.model_fields}
+                    self.meals[i] = meal.model_copy(update=changes)
+                    return self.meals[i]
+        return None
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """
+    Thread pool counting its busy workers and queued jobs, used as the event
+    loop's default executor (behind `asyncio.to_thread`).
+    """
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix="loadtest")
+        self.max_workers = max_workers
+        self._counter_lock = threading.Lock()
+        self.busy = 0
+        self.queued = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._counter_lock:
+            self.queued += 1
+
+        def run():
+            with self._counter_lock:
+                self.queued -= 1
+                self.busy += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._counter_lock:
+                    self.busy -= 1
+
+        return super().submit(run)
+
+async def _probe(executor: InstrumentedExecutor, samples: dict, stop: asyncio.Event) -> None:
+    """
+    Measures how late the event loop wakes up, and samples the thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL_SECONDS)
+        samples["lag"].append(max(0.0, loop.time() - start - LAG_PROBE_INTERVAL_SECONDS))
+        samples["busy"].append(executor.busy)
+        samples["queued"].append(executor.queued)
+
+async def _session(session_id: int, calls: int, mix: Dict[str, int], meal_ids: List[str], latencies: Dict[str, List[float]], errors: List[str], think_time: float, seed: int) -> None:
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from meals_mcp import server
+
+    rng = random.Random(seed + session_id)
+    operations, weights = list(mix), list(mix.values())
+    async with create_connected_server_and_client_session(server.app) as session:
+        for _ in range(calls):
+            operation = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                if operation == "list_tools":
+                    await session.list_tools()
+                    result = None
+                elif operation == "get_recent_meals":
+                    result = await session.call_tool("get_recent_meals", {"limit": 30})
+                elif operation == "get_recent_meals_days":
+                    result = await session.call_tool("get_recent_meals", {"days": 7})
+                elif operation == "get_recent_meals_search":
+                    result = await session.call_tool("get_recent_meals", {"search_query": rng.choice(INGREDIENTS)})
+                elif operation == "update_meal":
+                    meal_id = rng.choice(meal_ids)
+                    result = await session.call_tool("update_meal", {"meal_id": meal_id, "new_name": f"{rng.choice(DISHES)} ({session_id})"})
+                else:
+                    raise ValueError(f"Unknown operation: {operation}")
+                if result is not None and (result.isError or result.content[0].text.startswith("Error")):
+                    errors.append(f"{operation}: {result.content[0].text}")
+            except Exception as e:
+                errors.append(f"{operation}: {e}")
+            latencies.setdefault(operation, []).append(time.perf_counter() - start)
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, think_time))
+
+async def run_load_test(
+    sessions: int = 20,
+    calls: int = 20,
+    latency: float = 0.1,
+    jitter: float = 0.05,
+    meals: int = 500,
+    mix: Optional[Dict[str, int]] = None,
+    max_workers: Optional[int] = None,
+    think_time: float = 0.0,
+    seed: int = 0,
+) -> dict:
+    """
+    Runs `sessions` concurrent MCP sessions against the real server over
+    in-memory streams, each issuing `calls` operations drawn from `mix`,
+    with a FakeNotionClient answering after `latency` seconds.
+
+    The server's shared client, history and write queue are swapped for
+    the run and restored afterwards. Returns the raw measurements; see
+    `format_report`.
+    """
+    from meals_mcp import server
+    from meals_mcp.utils.history import MealHistory
+
+    mix = mix or DEFAULT_MIX
+    backend = FakeNotionClient(fake_meals(meals, seed), latency=latency, jitter=jitter, seed=seed)
+    meal_ids = [meal.id for meal in backend.meals[:50]]
+    loop = asyncio.get_running_loop()
+    # Same default size as asyncio's own executor
+    executor = InstrumentedExecutor(max_workers or min(32, (os.cpu_count() or 1) + 4))
+
+    saved = (server._client, server.history, server._write_queue)
+    server._client, server.history, server._write_queue = backend, MealHistory(), None
+    loop.set_default_executor(executor)
+
+    latencies: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    samples = {"lag": [], "busy": [], "queued": []}
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(executor, samples, stop))
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _session(i, calls, mix, meal_ids, latencies, errors, think_time, seed)
+            for i in range(sessions)
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        await probe
+        server._client, server.history, server._write_queue = saved
+        # Later to_thread calls get a fresh default executor
+        loop.set_default_executor(ThreadPoolExecutor())
+        executor.shutdown(wait=False)
+
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "sessions": sessions,
+        "calls": total,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "latencies": latencies,
+        "lag": samples["lag"],
+        "busy": samples["busy"],
+        "queued": samples["queued"],
+        "max_workers": executor.max_workers,
+        "backend_calls": backend.calls,
+        "backend_peak_in_flight": backend.peak_in_flight,
+    }
+
+def format_report(results: dict) -> str:
+    """
+    Renders the measurements of a load test as a text report.
+    """
+    all_latencies = [value for values in results["latencies"].values() for value in values]
+    report = f"Load test: {results['sessions']} sessions, {results['calls']} calls in {results['elapsed']:.2f} s\n"
+    report += f"- Throughput: {results['throughput']:.1f} calls/s\n"
+    report += f"- Errors: {len(results['errors'])}\n"
+    report += f"- Latency: p50 {percentile(all_latencies, 50) * 1000:.0f} ms, p99 {percentile(all_latencies, 99) * 1000:.0f} ms\n"
+    for operation, values in sorted(results["latencies"].items()):
+        report += f"  - {operation} ({len(values)}): p50 {percentile(values, 50) * 1000:.0f} ms, p99 {percentile(values, 99) * 1000:.0f} ms\n"
+
+    lag = results["lag"]
+    report += f"- Event-loop lag: p50 {percentile(lag, 50) * 1000:.1f} ms, p99 {percentile(lag, 99) * 1000:.1f} ms, max {max(lag, default=0) * 1000:.1f} ms\n"
+
+    busy, queued = results["busy"], results["queued"]
+    saturated = sum(1 for value in busy if value >= results["max_workers"])
+    report += f"- Thread pool: {results['max_workers']} workers, peak {max(busy, default=0)} busy, "
+    report += f"saturated {saturated * 100 // max(len(busy), 1)}% of the time, peak queue {max(queued, default=0)}\n"
+    report += f"- Notion backend: {results['backend_calls']} requests, peak {results['backend_peak_in_flight']} in flight\n"
+    return report
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="scripts/loadtest.py", description="Load test the meals MCP server against a fake Notion backend.")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent client sessions (default: 20).")
+    parser.add_argument("--calls", type=int, default=20, help="Operations per session (default: 20).")
+    parser.add_argument("--latency", type=float, default=0.1, help="Latency of the fake Notion API in seconds (default: 0.1).")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Random extra latency in seconds (default: 0.05).")
+    parser.add_argument("--meals", type=int, default=500, help="Size of the fake meal history (default: 500).")
+    parser.add_argument("--max-workers", type=int, help="Size of the thread pool behind asyncio.to_thread (default: asyncio's).")
+    parser.add_argument("--max-concurrent-calls", type=int, help="Maximum number of concurrent tool calls per session (default: the server's).")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Maximum pause between two operations of a session in seconds (default: 0).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    args = parser.parse_args(argv)
+
+    if args.max_concurrent_calls:
+        from meals_mcp import server
+
+        server.MAX_CONCURRENT_CALLS_PER_SESSION = args.max_concurrent_calls
+
+    results = asyncio.run(run_load_test(
+        sessions=args.sessions,
+        calls=args.calls,
+        latency=args.latency,
+        jitter=args.jitter,
+        meals=args.meals,
+        max_workers=args.max_workers,
+        think_time=args.think_time,
+        seed=args.seed,
+    ))
+    print(format_report(results))
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 from datetime import datetime, timedelta
@@ -5,18 +6,23 @@ from datetime import datetime, timedelta
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from meals_mcp.agents.batch import BatchPlanner, write_weeks
 from meals_mcp.agents.core import PlannerAgent, DieticalCoachAgent, CookerAgent
+from meals_mcp.utils.plans import commit_plan
 
 def get_date_input(prompt: str, default: str) -> str:
     user_input = input(f"{prompt} (YYYY-MM-DD, default: {default}): ").strip()
     return user_input if user_input else default
 
-def run_orchestrator():
-    # 1. Interactive Date Setup
+def get_next_monday() -> datetime:
     today = datetime.now()
-    # Default: Next Monday
     days_ahead = 0 - today.weekday() if today.weekday() < 0 else 7 - today.weekday()
-    next_monday = today + timedelta(days=days_ahead)
+    return today + timedelta(days=days_ahead)
+
+def run_orchestrator(store_cards: bool = False):
+    # 1. Interactive Date Setup
+    # Default: Next Monday
+    next_monday = get_next_monday()
     next_sunday = next_monday + timedelta(days=6)
     
     default_start = next_monday.strftime("%Y-%m-%d")
@@ -98,6 +104,17 @@ def run_orchestrator():
             print("🔄 Regenerating plan based on your feedback...\n")
 
 
+    # Commit the confirmed plan to Notion (safe to re-run: unchanged meals are skipped)
+    committed_meals = []
+    save_choice = input("Save this plan to Notion? (yes/no): ").strip().lower()
+    if save_choice in ["yes", "y", "ok"]:
+        print("💾 Saving the plan...")
+        result = commit_plan(planner.notion_client, current_plan)
+        committed_meals = result["created"] + result["updated"] + result["unchanged"]
+        print(f"   {len(result['created'])} created, {len(result['updated'])} updated, {len(result['unchanged'])} unchanged.")
+        for failure in result["failed"]:
+            print(f"   ❌ {failure['meal'].date} {failure['meal'].heure} ({failure['meal'].name}): {failure['error']}")
+
     # Final Output: Shopping List & Recipes
     if shopping_list:
         print("\n--- 🛒 Shopping List (Approx for 5) ---")
@@ -107,8 +124,50 @@ def run_orchestrator():
                 print(f"- {item['item']} ({item['quantity']})")
 
     print("\n--- 👨‍🍳 Chef's Recipe Cards ---")
-    tips = cooker.get_tips(current_plan)
+    # Only meals without a cached card are sent to the Cooker
+    tips = cooker.get_tips(
+        current_plan,
+        meals=planner.recent_meals + committed_meals,
+        notion_client=planner.notion_client if store_cards else None,
+    )
     print(tips)
 
+def run_batch(weeks: int, start_date: str, output: str, output_format: str = None, commit: bool = False, store_cards: bool = False):
+    print(f"\n--- 🍱 Planning {weeks} weeks from {start_date} ---\n")
+
+    planner = PlannerAgent()
+    batch = BatchPlanner(planner, DieticalCoachAgent(), CookerAgent(), reviser=PlannerAgent())
+    planned_weeks = batch.plan(start_date, weeks)
+
+    write_weeks(planned_weeks, output, output_format)
+    print(f"\n📄 Plan written to {output}")
+
+    if commit:
+        print("💾 Saving the plan...")
+        result = commit_plan(planner.notion_client, [plan for week in planned_weeks for plan in week.meals])
+        print(f"   {len(result['created'])} created, {len(result['updated'])} updated, {len(result['unchanged'])} unchanged.")
+        for failure in result["failed"]:
+            print(f"   ❌ {failure['meal'].date} {failure['meal'].heure} ({failure['meal'].name}): {failure['error']}")
+        if store_cards:
+            # Cards are cached by now: this only writes them to the committed pages
+            committed_meals = result["created"] + result["updated"] + result["unchanged"]
+            for week in planned_weeks:
+                batch.cooker.get_tips(week.meals, meals=committed_meals, notion_client=planner.notion_client)
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan the meals of the coming week(s).")
+    parser.add_argument("--weeks", type=int, help="Plan this many weeks without interaction (batch mode).")
+    parser.add_argument("--start", default=get_next_monday().strftime("%Y-%m-%d"), help="First day of the batch (YYYY-MM-DD, default: next Monday).")
+    parser.add_argument("--output", default="meal_plan.md", help="File the batch plan is written to (default: meal_plan.md).")
+    parser.add_argument("--format", choices=["json", "markdown"], help="Output format (default: guessed from the file extension).")
+    parser.add_argument("--commit", action="store_true", help="Save the batch plan to Notion once written.")
+    parser.add_argument("--store-cards", action="store_true", help="Also store the recipe cards on the saved Notion pages (in their 'Fiche' text property).")
+    args = parser.parse_args()
+
+    if args.weeks:
+        run_batch(args.weeks, args.start, args.output, args.format, args.commit, args.store_cards)
+    else:
+        run_orchestrator(args.store_cards)
+
 if __name__ == "__main__":
-    run_orchestrator()
+    main()
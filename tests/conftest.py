@@ -0,0 +1,9 @@
+import pytest
+from meals_mcp import server
+
+@pytest.fixture(autouse=True)
+def reset_shared_state(monkeypatch):
+    """Each test builds its own (usually mocked) shared Notion client, write queue and change feed."""
+    monkeypatch.setattr(server, "_client", None)
+    monkeypatch.setattr(server, "_write_queue", None)
+    monkeypatch.setattr(server, "_change_feed", None)
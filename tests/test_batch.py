@@ -0,0 +1,70 @@
+import json
+import threading
+from meals_mcp.agents.batch import BatchPlanner, to_markdown, week_ranges, write_weeks
+from meals_mcp.agents.core import Plan
+
+class FakePlanner:
+    def __init__(self, name="planner"):
+        self.name = name
+        self.calls = []
+
+    def create_plan(self, start_date, end_date, feedback=None, planned=None):
+        self.calls.append((start_date, feedback, [plan.soir for plan in planned or []]))
+        suffix = " (revised)" if feedback else ""
+        return [Plan(date=start_date, soir=f"{self.name} {start_date}{suffix}")], {"Épicerie": [{"item": "riz", "quantity": "500 g"}]}
+
+class FakeCoach:
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.threads = set()
+
+    def evaluate_plan(self, plans):
+        self.threads.add(threading.current_thread().name)
+        if plans[0].date in self.rejected and "revised" not in plans[0].soir:
+            return {"status": "REJECTED", "critique": "Trop de féculents."}
+        return {"status": "APPROVED", "critique": "Équilibré."}
+
+class FakeCooker:
+    def get_tips(self, plans, meals=None):
+        return f"Cartes pour {plans[0].soir}"
+
+def test_week_ranges():
+    assert week_ranges("2026-02-16", 2) == [("2026-02-16", "2026-02-22"), ("2026-02-23", "2026-03-01")]
+
+def test_batch_plans_weeks_in_order_and_feeds_them_forward():
+    planner, reviser, coach = FakePlanner(), FakePlanner("reviser"), FakeCoach()
+    batch = BatchPlanner(planner, coach, FakeCooker(), reviser=reviser, log=lambda message: None)
+
+    weeks = batch.plan("2026-02-16", 3)
+
+    assert [week.start_date for week in weeks] == ["2026-02-16", "2026-02-23", "2026-03-02"]
+    assert [week.tips for week in weeks] == [f"Cartes pour planner {week.start_date}" for week in weeks]
+    assert planner.calls[2][2] == ["planner 2026-02-16", "planner 2026-02-23"]
+    assert reviser.calls == []
+    # The Coach runs in its own stage, not on the Planner's thread
+    assert all(name.startswith("coach") for name in coach.threads)
+
+def test_batch_revises_rejected_weeks():
+    planner, reviser = FakePlanner(), FakePlanner("reviser")
+    batch = BatchPlanner(planner, FakeCoach(rejected={"2026-02-23"}), FakeCooker(), reviser=reviser, log=lambda message: None)
+
+    weeks = batch.plan("2026-02-16", 2)
+
+    assert reviser.calls == [("2026-02-23", "Trop de féculents.", ["planner 2026-02-16"])]
+    assert weeks[1].meals[0].soir == "reviser 2026-02-23 (revised)"
+    assert weeks[1].evaluation["status"] == "APPROVED"
+    assert weeks[1].tips == "Cartes pour reviser 2026-02-23 (revised)"
+
+def test_write_weeks(tmp_path):
+    batch = BatchPlanner(FakePlanner(), FakeCoach(), FakeCooker(), reviser=FakePlanner(), log=lambda message: None)
+    weeks = batch.plan("2026-02-16", 1)
+
+    write_weeks(weeks, str(tmp_path / "plan.json"))
+    data = json.loads((tmp_path / "plan.json").read_text(encoding="utf-8"))
+    assert data["weeks"][0]["meals"][0]["soir"] == "planner 2026-02-16"
+
+    markdown = to_markdown(weeks)
+    assert "## Week 1: 2026-02-16 to 2026-02-22" in markdown
+    assert "| 2026-02-16 |  | planner 2026-02-16 |" in markdown
+    assert "- riz (500 g)" in markdown
+    assert "Cartes pour planner 2026-02-16" in markdown
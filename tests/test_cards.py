@@ -0,0 +1,84 @@
+from meals_mcp.agents.core import Plan
+from meals_mcp.models import Meal
+from meals_mcp.utils.cards import RecipeCardCache, card_version, plan_slots, recipe_cards
+
+PLANS = [
+    Plan(date="2026-02-17", midi="Omelette", soir="Wok de poulet"),
+    Plan(date="2026-02-16", soir="Pâtes au thon"),
+]
+
+def test_card_version_changes_with_model_and_prompts():
+    assert card_version("gemini-2.0-flash", "a") == card_version("gemini-2.0-flash", "a")
+    assert card_version("gemini-2.0-flash", "a") != card_version("gemini-2.0-flash", "b")
+    assert card_version("gemini-2.0-flash", "a") != card_version("gemini-2.5-flash", "a")
+
+def test_cache_is_persistent_and_versioned(tmp_path):
+    path = str(tmp_path / "cards.json")
+    cache = RecipeCardCache(path, "v1")
+    cache.put("Pâtes au thon", "⏱️ 15 min")
+    cache.save()
+
+    assert RecipeCardCache(path, "v1").get("pates au Thon") == "⏱️ 15 min"
+    assert RecipeCardCache(path, "v2").get("Pâtes au thon") is None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = RecipeCardCache(str(tmp_path / "cards.json"), "v1", max_cards=2)
+    cache.put("Wok", "wok")
+    cache.put("Soupe", "soupe")
+    cache.get("Wok")
+    cache.put("Curry", "curry")
+
+    assert len(cache) == 2
+    assert cache.get("Soupe") is None
+    assert cache.get("Wok") == "wok"
+
+def test_seeding_the_cache_does_not_count_as_a_use(tmp_path):
+    cache = RecipeCardCache(str(tmp_path / "cards.json"), "v1", max_cards=2)
+    cache.put("Wok", "wok")
+    cache.put("Soupe", "soupe")
+    history = [Meal(id="a", name="Wok", date="2026-01-10", heure="Midi", card="wok")]
+    recipe_cards([Plan(date="2026-02-16", soir="Curry")], cache, lambda names: {name: "curry" for name in names}, meals=history)
+
+    # Wok is only in the history, so it is still the least recently used card
+    assert "Wok" not in cache
+    assert cache.get("Soupe") == "soupe"
+
+def test_plan_slots_are_in_day_order():
+    assert [(meal.date, meal.heure, meal.name) for meal in plan_slots(PLANS)] == [
+        ("2026-02-16", "Soir", "Pâtes au thon"),
+        ("2026-02-17", "Midi", "Omelette"),
+        ("2026-02-17", "Soir", "Wok de poulet"),
+    ]
+
+def test_only_uncached_meals_are_generated(tmp_path):
+    cache = RecipeCardCache(str(tmp_path / "cards.json"), "v1")
+    cache.put("pates au thon", "Carte pâtes")
+    requests = []
+
+    def generate(names):
+        requests.append(names)
+        return {name: f"Carte {name}" for name in names}
+
+    # The card stored on a Notion page is reused too
+    meals = [Meal(id="a", name="Omelette", date="2026-01-10", heure="Midi", card="Carte omelette")]
+    text = recipe_cards(PLANS, cache, generate, meals=meals)
+
+    assert requests == [["Wok de poulet"]]
+    assert text.index("Carte pâtes") < text.index("Carte omelette") < text.index("Carte Wok de poulet")
+    assert "Mardi 17/02, Soir: Wok de poulet" in text
+
+    recipe_cards(PLANS, RecipeCardCache(str(tmp_path / "cards.json"), "v1"), generate)
+    assert len(requests) == 1
+
+def test_new_cards_are_stored_on_the_planned_pages(tmp_path):
+    cache = RecipeCardCache(None, "v1")
+    cache.put("Omelette", "Carte omelette")
+    stored = []
+    meals = [
+        Meal(id="page-1", name="Wok de poulet", date="2026-02-17", heure="Soir"),
+        Meal(id="page-2", name="Omelette", date="2026-02-17", heure="Midi", card="Carte omelette"),
+    ]
+
+    recipe_cards(PLANS, cache, lambda names: {name: "Nouvelle carte" for name in names}, meals=meals, store=lambda meal_id, card: stored.append((meal_id, card)))
+
+    assert stored == [("page-1", "Nouvelle carte")]
@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from meals_mcp.models import Meal
+from meals_mcp.utils.changes import ChangeFeed
+from meals_mcp.utils.notion import NotionClient
+
+def edited(meal_id, name, time):
+    return Meal(id=meal_id, name=name, date="2026-02-14", heure="Soir", last_edited_time=time)
+
+def test_first_poll_only_sets_the_watermark():
+    client = MagicMock()
+    client.get_changed_meals.return_value = [edited("1", "Wok", "2026-02-14T10:31:00.000Z")]
+    feed = ChangeFeed(client)
+
+    assert feed.poll() == []
+    assert feed.watermark == "2026-02-14T10:31:00.000Z"
+    client.get_changed_meals.assert_called_once_with(since=None)
+
+def test_poll_reports_new_edits_once():
+    client = MagicMock()
+    feed = ChangeFeed(client)
+    client.get_changed_meals.return_value = [edited("1", "Wok", "2026-02-14T10:31:00.000Z")]
+    feed.poll()
+
+    # Notion returns the pages edited at the watermark minute again
+    client.get_changed_meals.return_value = [
+        edited("2", "Soupe", "2026-02-14T10:35:00.000Z"),
+        edited("1", "Wok", "2026-02-14T10:31:00.000Z"),
+    ]
+    assert [meal.id for meal in feed.poll()] == ["2"]
+    client.get_changed_meals.assert_called_with(since="2026-02-14T10:31:00.000Z")
+
+    client.get_changed_meals.return_value = [edited("2", "Soupe", "2026-02-14T10:35:00.000Z")]
+    assert feed.poll() == []
+
+    # A second edit within the same minute is told apart by its content
+    client.get_changed_meals.return_value = [edited("2", "Soupe de potiron", "2026-02-14T10:35:00.000Z")]
+    assert [meal.name for meal in feed.poll()] == ["Soupe de potiron"]
+    assert feed.changes == 2
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_get_changed_meals_stops_at_the_watermark(MockNotionAPIClient):
+    api = MockNotionAPIClient.return_value
+    api.search.return_value = {"results": [{"object": "data_source", "id": "ds-1"}]}
+    api.data_sources.retrieve.side_effect = Exception("No schema")
+
+    def page(page_id, time):
+        return {
+            "id": page_id,
+            "last_edited_time": time,
+            "properties": {"Name": {"title": [{"plain_text": page_id}]}, "Date": {"date": {"start": "2026-02-14"}}},
+        }
+
+    api.data_sources.query.return_value = {
+        "results": [page("new", "2026-02-14T10:35:00.000Z"), page("old", "2026-02-14T10:00:00.000Z")],
+        "has_more": True,
+        "next_cursor": "cursor",
+    }
+    client = NotionClient(auth_token="changes_token")
+
+    meals = client.get_changed_meals(since="2026-02-14T10:31:00.000Z")
+
+    assert [(meal.id, meal.last_edited_time) for meal in meals] == [("new", "2026-02-14T10:35:00.000Z")]
+    api.data_sources.query.assert_called_once_with(
+        data_source_id="ds-1",
+        page_size=100,
+        sorts=[{"timestamp": "last_edited_time", "direction": "descending"}],
+        filter={"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": "2026-02-14T10:31:00.000Z"}},
+    )
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_get_changed_meals_reads_every_edit_since_the_watermark(MockNotionAPIClient):
+    api = MockNotionAPIClient.return_value
+    api.search.return_value = {"results": [{"object": "data_source", "id": "ds-1"}]}
+    api.data_sources.retrieve.side_effect = Exception("No schema")
+
+    def page(i):
+        return {
+            "id": f"meal-{i}",
+            "last_edited_time": f"2026-02-14T{12 - i // 60:02d}:{59 - i % 60:02d}:00.000Z",
+            "properties": {"Name": {"title": [{"plain_text": f"Meal {i}"}]}, "Date": {"date": {"start": "2026-02-14"}}},
+        }
+
+    # 150 edits since the watermark, over two pages of results
+    api.data_sources.query.side_effect = [
+        {"results": [page(i) for i in range(100)], "has_more": True, "next_cursor": "cursor"},
+        {"results": [page(i) for i in range(100, 150)], "has_more": False, "next_cursor": None},
+    ]
+    client = NotionClient(auth_token="changes_token")
+
+    meals = client.get_changed_meals(since="2026-02-14T10:00:00.000Z")
+
+    assert [meal.id for meal in meals] == [f"meal-{i}" for i in range(150)]
+    assert api.data_sources.query.call_count == 2
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_errors_stay_off_stdout(MockNotionAPIClient, capsys):
+    api = MockNotionAPIClient.return_value
+    api.search.side_effect = Exception("Notion is down")
+    client = NotionClient(auth_token="stderr_token")
+
+    with pytest.raises(Exception):
+        client.get_changed_meals(since="2026-02-14T10:00:00.000Z")
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Notion is down" in captured.err
@@ -0,0 +1,66 @@
+from datetime import date
+from unittest.mock import patch
+from meals_mcp.models import Meal
+from meals_mcp.utils.dates import DateIndex, parse_date
+
+def make_meals():
+    return [
+        Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi"),
+        Meal(id="2", name="Wok", date="2026-02-17T19:30:00.000+01:00", heure="Soir"),
+        Meal(id="3", name="Soupe", date="2026-02-17", heure="Midi"),
+        # 2026-02-17 22:30 UTC, but the 18th where it was eaten
+        Meal(id="4", name="Raclette", date="2026-02-18T00:30:00.000+02:00", heure="Soir"),
+        Meal(id="5", name="Pizza", date="2026-02-20", heure="Soir"),
+    ]
+
+def test_parse_date():
+    assert parse_date("2026-02-17") == (739664, 1771286400.0)
+    assert parse_date("2026-02-17T19:30:00.000+01:00") == (739664, 1771353000.0)
+    assert parse_date("2026-02-17T18:30:00Z") == (739664, 1771353000.0)
+    assert parse_date("2026-02-17T18:30:00") == (739664, 1771353000.0)
+
+def test_meal_normalized_dates():
+    meal = Meal(name="Wok", date="2026-02-17T19:30:00.000+01:00", heure="Soir")
+    assert meal.day == date(2026, 2, 17)
+    assert meal.ordinal == date(2026, 2, 17).toordinal()
+    # Updating the date never leaves a stale normalized form behind
+    assert meal.model_copy(update={"date": "2026-02-18"}).day == date(2026, 2, 18)
+
+def test_range_is_inclusive_on_days():
+    index = DateIndex(make_meals())
+    assert [meal.id for meal in index.range("2026-02-17", "2026-02-17")] == ["2", "3"]
+    assert [meal.id for meal in index.range(start_date="2026-02-18")] == ["5", "4"]
+    assert [meal.id for meal in index.range(end_date="2026-02-14")] == ["1"]
+    assert len(index.range()) == 5
+
+def test_last_days():
+    index = DateIndex(make_meals())
+    assert [meal.id for meal in index.last_days(3, today=date(2026, 2, 19))] == ["4", "2", "3"]
+
+def test_recent():
+    index = DateIndex(make_meals())
+    assert [meal.id for meal in index.recent(2)] == ["5", "4"]
+    assert len(index.recent(10)) == 5
+    assert index.recent(0) == []
+
+def test_incremental_update():
+    index = DateIndex(make_meals())
+    index.update(Meal(id="1", name="Omelette", date="2026-02-21", heure="Midi"))
+    assert [meal.id for meal in index.range(start_date="2026-02-20")] == ["1", "5"]
+    assert index.range(end_date="2026-02-16") == []
+    assert len(index) == 5
+
+def test_meal_dates_are_parsed_once():
+    with patch("meals_mcp.models.parse_date", wraps=parse_date) as parse:
+        meal = Meal(id="1", name="Wok", date="2026-02-17T19:30:00.000+01:00", heure="Soir")
+        DateIndex([meal] * 3)
+        assert (meal.ordinal, meal.day) == (date(2026, 2, 17).toordinal(), date(2026, 2, 17))
+        assert parse.call_count == 1
+
+        # Copies and assignments keep the parsed date in sync
+        moved = meal.model_copy(update={"date": "2026-02-18"})
+        assert moved.day == date(2026, 2, 18)
+        assert meal.model_copy(update={"name": "Curry"}).timestamp == meal.timestamp
+        meal.date = "2026-02-19"
+        assert meal.day == date(2026, 2, 19)
+        assert parse.call_count == 3
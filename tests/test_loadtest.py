@@ -0,0 +1,41 @@
+import os
+import sys
+import pytest
+from meals_mcp import server
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from loadtest import FakeNotionClient, fake_meals, format_report, percentile, run_load_test
+
+def test_percentile():
+    values = [0.1 * i for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(5.0)
+    assert percentile(values, 99) == pytest.approx(9.9)
+    assert percentile([], 99) == 0.0
+
+def test_fake_client_updates_meals():
+    client = FakeNotionClient(fake_meals(10), latency=0, jitter=0)
+
+    updated = client.update_meal("meal-3", {"name": "Wok"})
+
+    assert updated.name == "Wok"
+    assert client.get_meals(limit=5)[3].name == "Wok"
+    assert client.calls == 2
+
+@pytest.mark.asyncio
+async def test_run_load_test():
+    history = server.history
+
+    results = await run_load_test(sessions=4, calls=5, latency=0.001, jitter=0, meals=40, max_workers=2)
+
+    assert results["calls"] == 20
+    assert results["errors"] == []
+    assert results["backend_calls"] > 0
+    assert max(results["busy"], default=0) <= 2
+    # The server state is restored after the run
+    assert server.history is history
+    assert server._client is None
+
+    report = format_report(results)
+    assert "Load test: 4 sessions, 20 calls" in report
+    assert "Thread pool: 2 workers" in report
@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import MagicMock
+from meals_mcp.agents.core import Plan
+from meals_mcp.models import Meal
+from meals_mcp.utils.plans import RateLimiter, commit_plan, plan_meals
+
+class RateLimited(Exception):
+    code = "rate_limited"
+
+def make_client(existing):
+    client = MagicMock()
+    client.get_meals.return_value = existing
+    client.add_meal.side_effect = lambda meal: meal.model_copy(update={"id": f"new-{meal.date}-{meal.heure}"})
+    client.update_meal.side_effect = lambda meal_id, updates: Meal(id=meal_id, name=updates["name"], date="2026-02-16", heure="Soir")
+    return client
+
+def test_plan_meals():
+    meals = plan_meals([
+        Plan(date="2026-02-16", soir="Wok"),
+        {"date": "2026-02-17", "midi": "Omelette", "soir": " Soupe "},
+    ])
+
+    assert [(meal.date, meal.heure, meal.name) for meal in meals] == [
+        ("2026-02-16", "Soir", "Wok"),
+        ("2026-02-17", "Midi", "Omelette"),
+        ("2026-02-17", "Soir", "Soupe"),
+    ]
+    with pytest.raises(ValueError):
+        plan_meals([{"date": "", "soir": "Wok"}])
+
+def test_commit_plan_creates_updates_and_skips():
+    client = make_client([
+        Meal(id="a", name="Omelette", date="2026-02-17T12:30:00.000+01:00", heure="Midi"),
+        Meal(id="b", name="Pâtes", date="2026-02-16", heure="Soir", ingredients=["pâtes"], recipe="http://pates.com", card="Carte pâtes"),
+    ])
+    plans = [Plan(date="2026-02-16", soir="Wok"), Plan(date="2026-02-17", midi="Omelette", soir="Soupe")]
+
+    result = commit_plan(client, plans, limiter=RateLimiter(rate=1000))
+
+    client.get_meals.assert_called_once_with(limit=100, start_date="2026-02-16", end_date="2026-02-17")
+    client.update_meal.assert_called_once_with(meal_id="b", updates={"name": "Wok", "ingredients": [], "recipe": "", "card": ""})
+    assert [meal.id for meal in result["created"]] == ["new-2026-02-17-Soir"]
+    assert [meal.id for meal in result["updated"]] == ["b"]
+    assert [meal.id for meal in result["unchanged"]] == ["a"]
+    assert result["failed"] == []
+
+def test_commit_plan_is_idempotent():
+    existing = [
+        Meal(id="a", name="Wok", date="2026-02-16", heure="Soir"),
+        Meal(id="b", name="Omelette", date="2026-02-17", heure="midi"),
+    ]
+    client = make_client(existing)
+
+    result = commit_plan(client, [Plan(date="2026-02-16", soir="Wok"), Plan(date="2026-02-17", midi="Omelette", soir="")], limiter=RateLimiter(rate=1000))
+
+    assert len(result["unchanged"]) == 2
+    client.add_meal.assert_not_called()
+    client.update_meal.assert_not_called()
+
+def test_commit_plan_retries_rate_limited_writes():
+    client = make_client([])
+    calls = []
+
+    def add_meal(meal):
+        calls.append(meal.name)
+        if len(calls) == 1:
+            raise RateLimited("Rate limited")
+        return meal.model_copy(update={"id": "1"})
+
+    client.add_meal.side_effect = add_meal
+    result = commit_plan(client, [Plan(date="2026-02-16", soir="Wok")], limiter=RateLimiter(rate=1000), retry_delay=0)
+
+    assert calls == ["Wok", "Wok"]
+    assert [meal.id for meal in result["created"]] == ["1"]
+
+def test_commit_plan_reports_failures():
+    client = make_client([])
+    client.add_meal.side_effect = ValueError("Invalid property")
+
+    result = commit_plan(client, [Plan(date="2026-02-16", soir="Wok")], limiter=RateLimiter(rate=1000))
+
+    assert result["created"] == []
+    assert result["failed"][0]["meal"].name == "Wok"
+    assert result["failed"][0]["error"] == "Invalid property"
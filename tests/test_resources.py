@@ -0,0 +1,53 @@
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+from meals_mcp.models import Meal
+from meals_mcp.utils.history import MealHistory
+from meals_mcp.utils.resources import meal_resource_uris, parse_uri, resource_meta, resource_version, week_range
+from meals_mcp.utils.writebehind import WriteBehindQueue
+
+def test_parse_uri():
+    assert parse_uri("meals://recent") == ("recent", None)
+    assert parse_uri("meals://week/2026-W07") == ("week", "2026-W07")
+    assert parse_uri("meals://meal/abc-123") == ("meal", "abc-123")
+    with pytest.raises(ValueError):
+        parse_uri("meals://meal/")
+    with pytest.raises(ValueError):
+        parse_uri("meals://stats")
+
+def test_week_range():
+    assert week_range("2026-W07") == ("2026-02-09", "2026-02-15")
+    assert week_range("2026-W01") == ("2025-12-29", "2026-01-04")
+    with pytest.raises(ValueError):
+        week_range("2026-07")
+
+def test_meal_resource_uris():
+    meal = Meal(id="1", name="Wok", date="2026-02-14T19:30:00.000+01:00", heure="Soir")
+    assert meal_resource_uris(meal) == {"meals://recent", "meals://week/2026-W07", "meals://meal/1"}
+
+def test_version_follows_last_edited_time():
+    meals = [
+        Meal(id="1", name="Wok", date="2026-02-14", heure="Soir", last_edited_time="2026-02-14T10:31:00.000Z"),
+        Meal(id="2", name="Soupe", date="2026-02-13", heure="Soir", last_edited_time="2026-02-13T08:00:00.000Z"),
+    ]
+    edited = [meals[0].model_copy(update={"last_edited_time": "2026-02-15T09:00:00.000Z"}), meals[1]]
+
+    assert resource_version(meals) == resource_version(list(meals))
+    assert resource_version(edited) != resource_version(meals)
+    assert resource_version(meals[:1]) != resource_version(meals)
+    assert resource_meta(meals)["lastModified"] == "2026-02-14T10:31:00.000Z"
+    # Without edit times (snapshots), the content is the version
+    assert resource_version([Meal(id="1", name="Wok", date="2026-02-14", heure="Soir")]) != resource_version([Meal(id="1", name="Curry", date="2026-02-14", heure="Soir")])
+
+def test_version_follows_write_behind_edits(tmp_path):
+    history = MealHistory()
+    history.load([Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi", last_edited_time="2026-02-14T10:31:00.000Z")])
+    before = resource_meta(history.meals)
+    queue = WriteBehindQueue(MagicMock(), str(tmp_path / "journal.jsonl"), history=history)
+
+    queue.submit("1", {"name": "Omelette aux herbes"})
+
+    # The edit is not in Notion yet, so the edit time is unchanged
+    after = resource_meta(history.meals)
+    assert after["lastModified"] == before["lastModified"]
+    assert after["version"] != before["version"]
@@ -0,0 +1,135 @@
+import pytest
+from unittest.mock import patch
+from meals_mcp.utils.notion import NotionClient
+from meals_mcp.utils.schema import MealSchema
+
+PROPERTIES = {
+    "": {"id": "title", "type": "title"},
+    "Date": {"id": "a", "type": "date"},
+    "Ingredients": {"id": "b", "type": "multi_select"},
+    "Heure": {"id": "c", "type": "select"},
+    "Recipe": {"id": "d", "type": "files"},
+}
+
+PAGE = {
+    "id": "page-1",
+    "properties": {
+        "": {"title": [{"plain_text": "Wok de poulet"}]},
+        "Date": {"date": {"start": "2026-02-14"}},
+        "Ingredients": {"multi_select": [{"name": "poulet"}, {"name": "légumes"}]},
+        "Heure": {"select": {"name": "Soir"}},
+        "Recipe": {"files": [{"external": {"url": "http://recipe.com"}}]},
+    },
+}
+
+def test_extract():
+    schema = MealSchema(PROPERTIES)
+    meal = schema.extract(PAGE)
+
+    assert schema.title == ""
+    assert meal.id == "page-1"
+    assert meal.name == "Wok de poulet"
+    assert meal.ingredients == ["poulet", "légumes"]
+    assert meal.heure == "Soir"
+    assert meal.recipe == "http://recipe.com"
+    assert schema.extract({"properties": {"": {"title": []}, "Date": {"date": None}}}) is None
+
+def test_build_properties():
+    schema = MealSchema(PROPERTIES)
+    properties = schema.build_properties({"name": "Wok", "ingredients": [], "heure": None, "recipe": "http://r.com"})
+
+    assert properties == {
+        "": {"title": [{"text": {"content": "Wok"}}]},
+        "Ingredients": {"multi_select": []},
+        "Recipe": {"files": [{"name": "http://r.com", "type": "external", "external": {"url": "http://r.com"}}]},
+    }
+
+def test_clear_recipe():
+    assert MealSchema(PROPERTIES).build_properties({"recipe": ""}) == {"Recipe": {"files": []}}
+    schema = MealSchema(dict(PROPERTIES, Lien={"type": "url"}))
+    assert schema.build_properties({"recipe": ""}) == {"Lien": {"url": None}}
+
+def test_missing_properties():
+    with pytest.raises(ValueError):
+        MealSchema({"Date": {"type": "date"}})
+    schema = MealSchema({"Name": {"type": "title"}, "Date": {"type": "date"}})
+    with pytest.raises(ValueError):
+        schema.build_properties({"heure": "Midi"})
+
+def test_unrelated_properties_are_not_mapped():
+    schema = MealSchema({
+        "Name": {"type": "title"},
+        "Date": {"type": "date"},
+        "Catégorie": {"type": "select"},
+        "Tags": {"type": "multi_select"},
+        "Source": {"type": "url"},
+    })
+
+    assert (schema.heure, schema.ingredients, schema.recipe_url, schema.recipe_files) == (None, None, None, None)
+    assert schema.build_properties({"name": "Wok"}) == {"Name": {"title": [{"text": {"content": "Wok"}}]}}
+    for updates in ({"heure": "Soir"}, {"ingredients": []}, {"recipe": "http://r.com"}):
+        with pytest.raises(ValueError):
+            schema.build_properties(updates)
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_update_uses_introspected_title(MockNotionAPIClient):
+    api = MockNotionAPIClient.return_value
+    api.search.return_value = {"results": [{"object": "data_source", "id": "ds-1"}]}
+    api.data_sources.retrieve.return_value = {"properties": PROPERTIES}
+    api.pages.update.return_value = PAGE
+    client = NotionClient(auth_token="schema_token")
+
+    meal = client.update_meal("page-1", {"name": "Wok de poulet"})
+    client.update_meal("page-1", {"heure": "Soir"})
+
+    api.data_sources.retrieve.assert_called_once_with(data_source_id="ds-1")
+    api.pages.update.assert_any_call(page_id="page-1", properties={"": {"title": [{"text": {"content": "Wok de poulet"}}]}})
+    assert meal.name == "Wok de poulet"
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_schema_is_fetched_again_after_a_transient_error(MockNotionAPIClient):
+    api = MockNotionAPIClient.return_value
+    api.search.return_value = {"results": [{"object": "data_source", "id": "ds-1"}]}
+    api.data_sources.retrieve.side_effect = [Exception("rate limited"), {"properties": PROPERTIES}]
+    api.pages.update.return_value = PAGE
+    client = NotionClient(auth_token="transient_schema_token")
+
+    client.update_meal("page-1", {"name": "Wok"})
+    api.pages.update.assert_called_with(page_id="page-1", properties={"Name": {"title": [{"text": {"content": "Wok"}}]}})
+
+    # Retried once the delay is over
+    client._schema_retry_at = 0.0
+    client.update_meal("page-1", {"name": "Wok"})
+    api.pages.update.assert_called_with(page_id="page-1", properties={"": {"title": [{"text": {"content": "Wok"}}]}})
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_unusable_schema_is_not_fetched_again(MockNotionAPIClient):
+    api = MockNotionAPIClient.return_value
+    api.search.return_value = {"results": [{"object": "data_source", "id": "ds-1"}]}
+    api.data_sources.retrieve.return_value = {"properties": {"Name": {"type": "title"}}}
+    api.pages.update.return_value = PAGE
+    client = NotionClient(auth_token="unusable_schema_token")
+
+    client.update_meal("page-1", {"name": "Wok"})
+    client._schema_retry_at = 0.0
+    client.update_meal("page-1", {"name": "Wok"})
+
+    api.data_sources.retrieve.assert_called_once_with(data_source_id="ds-1")
+
+def test_recipe_card_property():
+    schema = MealSchema(dict(PROPERTIES, Fiche={"type": "rich_text"}))
+    page = {"id": "page-1", "properties": dict(PAGE["properties"], Fiche={"rich_text": [{"plain_text": "⏱️ 20 min"}, {"plain_text": " au wok"}]})}
+
+    assert schema.extract(page).card == "⏱️ 20 min au wok"
+    properties = schema.build_properties({"card": "x" * 2500})
+    assert [len(part["text"]["content"]) for part in properties["Fiche"]["rich_text"]] == [2000, 500]
+    assert schema.build_properties({"card": ""}) == {"Fiche": {"rich_text": []}}
+
+def test_recipe_card_needs_fiche_property():
+    schema = MealSchema(dict(PROPERTIES, Notes={"type": "rich_text"}))
+    page = {"id": "page-1", "properties": dict(PAGE["properties"], Notes={"rich_text": [{"plain_text": "Sans gluten"}]})}
+
+    assert schema.card is None
+    assert schema.extract(page).card is None
+    with pytest.raises(ValueError):
+        schema.build_properties({"card": "⏱️ 20 min"})
@@ -0,0 +1,50 @@
+from meals_mcp.models import Meal
+from meals_mcp.utils.search import SearchIndex, normalize_text, tokenize
+
+def make_index():
+    return SearchIndex([
+        Meal(id="1", name="Pâtes au thon et à la tomate", date="2026-02-17", ingredients=["pâtes", "thon", "tomate"], heure="Soir"),
+        Meal(id="2", name="Lasagnes à la bolognaise", date="2026-02-21", ingredients=["pâtes", "viande hachée", "tomate"], heure="Soir"),
+        Meal(id="3", name="Pâtes au thon et à la tomate", date="2025-12-03", ingredients=["pâtes", "thon", "tomate"], heure="Soir"),
+        Meal(id="4", name="Gratin de patates douces", date="2026-01-08", ingredients=["patate douce"], heure="Soir"),
+        Meal(id="5", name="Œufs cocotte", date="2026-01-09", ingredients=["oeufs", "crème"], heure="Midi"),
+    ])
+
+def test_normalize_and_tokenize():
+    assert normalize_text("Pâtes & Œufs!") == "pates oeufs"
+    assert tokenize("Curry de légumes") == ["curry", "legume"]
+
+def test_accent_and_plural_insensitive():
+    index = make_index()
+    results = index.search("Pate", include_ingredients=False)
+    # Name matches first, most recent first; "patates" is a weaker match
+    assert [meal.id for meal, _ in results] == ["1", "3", "4"]
+    assert results[0][1] > results[2][1]
+    assert [meal.id for meal, _ in index.search("oeuf")] == ["5"]
+
+def test_typos_and_all_words_required():
+    index = make_index()
+    assert [meal.id for meal, _ in index.search("lasagne bolognese")] == ["2"]
+    assert [meal.id for meal, _ in index.search("pates thon", include_ingredients=False)] == ["1", "3"]
+    assert index.search("pates poulet") == []
+
+def test_ingredients_rank_below_names():
+    index = make_index()
+    results = index.search("tomates")
+    assert [meal.id for meal, _ in results] == ["1", "3", "2"]
+
+def test_incremental_update():
+    index = make_index()
+    index.update(Meal(id="4", name="Gratin dauphinois", date="2026-01-08", ingredients=["pomme de terre"], heure="Soir"))
+    assert [meal.id for meal, _ in index.search("douce")] == []
+    assert [meal.id for meal, _ in index.search("dauphinois")] == ["4"]
+    index.remove("4")
+    assert index.search("dauphinois") == []
+
+def test_ties_rank_the_latest_meal_first_across_timezones():
+    # 20:00 in New York is later than 22:00 in London on the same day
+    index = SearchIndex([
+        Meal(id="1", name="Wok", date="2026-02-14T22:00:00+00:00", heure="Soir"),
+        Meal(id="2", name="Wok", date="2026-02-14T20:00:00-05:00", heure="Soir"),
+    ])
+    assert [meal.id for meal, _ in index.search("wok")] == ["2", "1"]
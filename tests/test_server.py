@@ -1,16 +1,24 @@
+import datetime
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from mcp.types import TextContent
+from meals_mcp import server
 from meals_mcp.server import call_tool, list_tools
 from meals_mcp.models import Meal
+from meals_mcp.utils.history import MealHistory
+from meals_mcp.utils.singleflight import SingleFlight
 
 @pytest.mark.asyncio
 async def test_list_tools():
     tools = await list_tools()
-    assert len(tools) == 2
+    assert len(tools) == 6
     tool_names = [tool.name for tool in tools]
     assert "get_recent_meals" in tool_names
     assert "update_meal" in tool_names
+    assert "get_meal_stats" in tool_names
+    assert "find_similar_meals" in tool_names
+    assert "commit_meal_plan" in tool_names
+    assert "get_server_status" in tool_names
 
 @pytest.mark.asyncio
 async def test_call_tool():
@@ -45,15 +53,25 @@ async def test_call_tool():
 
 @pytest.mark.asyncio
 async def test_call_tool_search():
-    with patch("meals_mcp.server.NotionClient") as MockNotionClient:
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()):
         mock_instance = MockNotionClient.return_value
-        mock_instance.get_meals.return_value = [
+        mock_instance.get_all_meals.return_value = [
             Meal(
+                id="1",
                 name="Pasta",
                 date="2023-10-27",
                 ingredients=["Pasta", "Tomato"],
                 heure="soir",
                 recipe=None
+            ),
+            Meal(
+                id="2",
+                name="Pâtes au thon",
+                date="2023-10-20",
+                ingredients=["pâtes", "thon"],
+                heure="soir",
+                recipe=None
             )
         ]
 
@@ -65,9 +83,13 @@ async def test_call_tool_search():
         text = result[0].text
         assert "Here are the meals matching 'Pasta':" in text
         assert "**Pasta**" in text
-        
-        # Verify search_query was passed correctly
-        mock_instance.get_meals.assert_called_with(limit=30, start_date=None, end_date=None, search_query="Pasta")
+        assert "Pâtes" not in text
+
+        # Accent-insensitive search on the same history snapshot
+        result = await call_tool("get_recent_meals", {"search_query": "pates"})
+        assert "**Pâtes au thon**" in result[0].text
+        mock_instance.get_all_meals.assert_called_once()
+        mock_instance.get_meals.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_call_tool_empty():
@@ -78,3 +100,215 @@ async def test_call_tool_empty():
         result = await call_tool("get_recent_meals", {})
         
         assert "No meals found" in result[0].text
+
+@pytest.mark.asyncio
+async def test_call_tool_meal_stats():
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()):
+        mock_instance = MockNotionClient.return_value
+        mock_instance.get_all_meals.return_value = [
+            Meal(name="Wok", date="2026-02-14", ingredients=["poulet", "légumes"], heure="Soir"),
+            Meal(name="Fajitas", date="2026-02-20", ingredients=["poulet", "poivron"], heure="Soir"),
+            Meal(name="Soupe", date="2026-02-15", ingredients=["légumes"], heure="Soir"),
+        ]
+
+        result = await call_tool("get_meal_stats", {"ingredient": "Poulet"})
+
+        text = result[0].text
+        assert "Eaten in 2 of 3 meals (66%)" in text
+        assert "Last seen: 2026-02-20" in text
+        assert "- 2026-02: 2" in text
+        assert "- légumes: 1" in text
+
+        # The history snapshot is reused by the next call
+        await call_tool("get_meal_stats", {})
+        mock_instance.get_all_meals.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_call_tool_find_similar_meals():
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()):
+        mock_instance = MockNotionClient.return_value
+        mock_instance.get_all_meals.return_value = [
+            Meal(id="1", name="Curry de pois chiches", date="2026-02-19", ingredients=["pois chiche", "curry"], heure="Soir"),
+            Meal(id="2", name="Curry de légumes", date="2026-01-10", ingredients=["curry", "légumes"], heure="Soir"),
+            Meal(id="3", name="Houmous", date="2026-01-05", ingredients=["pois chiche"], heure="Midi"),
+        ]
+
+        result = await call_tool("find_similar_meals", {"name": "curry de pois", "exclude_ingredients": ["pois chiche"]})
+
+        text = result[0].text
+        assert "Meals similar to **Curry de pois chiches** without pois chiche" in text
+        assert "**Curry de légumes**" in text
+        assert "Houmous" not in text
+
+def test_http_app_initialize():
+    from starlette.testclient import TestClient
+    from meals_mcp.server import create_http_app
+
+    with TestClient(create_http_app()) as client:
+        response = client.post(
+            "/mcp/",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {"protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": {"name": "test", "version": "0"}},
+            },
+            headers={"Accept": "application/json, text/event-stream"},
+        )
+
+    assert response.status_code == 200
+    assert "mcp-session-id" in response.headers
+    assert '"serverInfo"' in response.text
+
+@pytest.mark.asyncio
+async def test_call_tool_server_status():
+    with patch("meals_mcp.utils.notion.reads", SingleFlight()) as reads:
+        reads.calls, reads.executions = 4, 3
+
+        result = await call_tool("get_server_status", {})
+
+        assert "Notion reads: 4 requested, 3 sent, 1 coalesced (25%)" in result[0].text
+
+@pytest.mark.asyncio
+async def test_call_tool_update_meal_write_behind(tmp_path):
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()) as history, \
+         patch("meals_mcp.server.WRITE_BEHIND_JOURNAL", str(tmp_path / "journal.jsonl")):
+        mock_instance = MockNotionClient.return_value
+        history.load([Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi")])
+
+        result = await call_tool("update_meal", {"meal_id": "1", "new_name": "Omelette aux herbes"})
+
+        assert "**Omelette aux herbes** (2026-02-14, Midi)" in result[0].text
+        mock_instance.update_meal.assert_not_called()
+
+        result = await call_tool("get_server_status", {})
+        assert "Pending writes: 1 (on 1 meals)" in result[0].text
+
+        # Failed writes are listed until cleared
+        mock_instance.update_meal.side_effect = RuntimeError("Notion is down")
+        write_queue = server.get_write_queue()
+        write_queue.max_attempts = 1
+        write_queue.flush()
+        result = await call_tool("get_server_status", {"clear_failed_writes": True})
+        assert "Failed writes: 1" in result[0].text
+        assert "(1 failed writes cleared)" in result[0].text
+        result = await call_tool("get_server_status", {})
+        assert "Failed writes: 0" in result[0].text
+
+@pytest.mark.asyncio
+async def test_call_tool_date_range():
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()):
+        mock_instance = MockNotionClient.return_value
+        mock_instance.get_all_meals.return_value = [
+            Meal(id="2", name="Wok", date="2026-02-17T19:30:00.000+01:00", heure="Soir"),
+            Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi"),
+        ]
+
+        result = await call_tool("get_recent_meals", {"start_date": "2026-02-15", "end_date": "2026-02-17"})
+
+        text = result[0].text
+        assert "Here are the meals from 2026-02-15 to 2026-02-17:" in text
+        assert "**Wok**" in text
+        assert "Omelette" not in text
+        mock_instance.get_meals.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_call_tool_last_days():
+    today = datetime.date.today()
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()):
+        mock_instance = MockNotionClient.return_value
+        mock_instance.get_all_meals.return_value = [
+            Meal(id="2", name="Wok", date=today.isoformat(), heure="Soir"),
+            Meal(id="1", name="Omelette", date=(today - datetime.timedelta(days=2)).isoformat(), heure="Midi"),
+        ]
+
+        result = await call_tool("get_recent_meals", {"days": 2})
+
+        text = result[0].text
+        assert f"Here are the meals from {today - datetime.timedelta(days=1)} to {today}:" in text
+        assert "**Wok**" in text
+        assert "Omelette" not in text
+        mock_instance.get_meals.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_call_tool_commit_meal_plan():
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()) as history:
+        mock_instance = MockNotionClient.return_value
+        mock_instance.get_meals.return_value = [Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi")]
+        mock_instance.add_meal.side_effect = lambda meal: meal.model_copy(update={"id": "2"})
+        history.load([])
+
+        result = await call_tool("commit_meal_plan", {"meals": [{"date": "2026-02-14", "midi": "Omelette", "soir": "Wok"}]})
+
+        text = result[0].text
+        assert "1 created, 0 updated, 1 unchanged, 0 failed" in text
+        assert "Created: **Wok** (2026-02-14, Soir)" in text
+        mock_instance.update_meal.assert_not_called()
+        assert [meal.id for meal in history.meals] == ["2"]
+
+@pytest.mark.asyncio
+async def test_changes_are_notified_to_subscribed_sessions():
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from meals_mcp.server import app, notify_changes
+
+    notifications = []
+
+    async def message_handler(message):
+        if hasattr(message, "root"):
+            notifications.append(str(message.root.params.uri))
+
+    with patch("meals_mcp.server.history", MealHistory()) as history:
+        history.load([Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi")])
+
+        async with create_connected_server_and_client_session(app, message_handler=message_handler) as session:
+            assert session.get_server_capabilities().resources.subscribe
+            await session.subscribe_resource("meals://meal/1")
+            await session.subscribe_resource("meals://week/2026-W07")
+
+            # Moved to the following week
+            await notify_changes([Meal(id="1", name="Omelette aux herbes", date="2026-02-16", heure="Midi")])
+            await session.send_ping()
+
+        assert notifications == ["meals://meal/1", "meals://week/2026-W07"]
+        assert history.meals[0].name == "Omelette aux herbes"
+
+@pytest.mark.asyncio
+async def test_meal_resources():
+    import json
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from meals_mcp.server import app
+
+    with patch("meals_mcp.server.NotionClient") as MockNotionClient, \
+         patch("meals_mcp.server.history", MealHistory()) as history:
+        mock_instance = MockNotionClient.return_value
+        mock_instance.get_all_meals.return_value = [
+            Meal(id="2", name="Wok", date="2026-02-17", heure="Soir", last_edited_time="2026-02-17T20:00:00.000Z"),
+            Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi", last_edited_time="2026-02-14T13:00:00.000Z"),
+        ]
+
+        async with create_connected_server_and_client_session(app) as session:
+            resources = await session.list_resources()
+            assert "meals://recent" in [str(resource.uri) for resource in resources.resources]
+            templates = await session.list_resource_templates()
+            assert {template.uriTemplate for template in templates.resourceTemplates} == {"meals://week/{iso_week}", "meals://meal/{id}"}
+
+            week = (await session.read_resource("meals://week/2026-W07")).contents[0]
+            assert [meal["name"] for meal in json.loads(week.text)] == ["Omelette"]
+            assert week.meta["lastModified"] == "2026-02-14T13:00:00.000Z"
+
+            meal = (await session.read_resource("meals://meal/2")).contents[0]
+            assert json.loads(meal.text)["name"] == "Wok"
+
+            recent = (await session.read_resource("meals://recent")).contents[0]
+            history.apply_update(Meal(id="2", name="Wok", date="2026-02-17", heure="Soir", last_edited_time="2026-02-18T09:00:00.000Z"))
+            assert (await session.read_resource("meals://recent")).contents[0].meta["version"] != recent.meta["version"]
+            assert (await session.read_resource("meals://week/2026-W07")).contents[0].meta == week.meta
+
+        # Served from the cached history
+        mock_instance.get_all_meals.assert_called_once()
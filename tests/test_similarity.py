@@ -0,0 +1,52 @@
+from meals_mcp.models import Meal
+from meals_mcp.utils.history import MealHistory
+from meals_mcp.utils.similarity import SimilarityIndex
+
+def make_meals():
+    return [
+        Meal(id="1", name="Curry de chou-fleur et pois chiches", date="2026-02-19", ingredients=["chou-fleur", "pois chiche", "curry"], heure="Soir"),
+        Meal(id="2", name="Curry de légumes", date="2026-01-10", ingredients=["Curry", "légumes", "riz"], heure="Soir"),
+        Meal(id="3", name="Dahl de lentilles", date="2026-01-05", ingredients=["lentilles", "curry", "pois chiche"], heure="Soir"),
+        Meal(id="4", name="Curry de légumes", date="2025-11-02", ingredients=["curry", "légumes"], heure="Soir"),
+        Meal(id="5", name="Croque-monsieur", date="2026-02-02", ingredients=["pain", "jambon"], heure="Soir"),
+    ]
+
+def test_similar_ranks_by_cosine():
+    index = SimilarityIndex(make_meals())
+    reference = index.find(name="curry de chou-fleur et pois chiches")
+
+    results = index.similar(reference, k=5)
+
+    names = [meal.name for meal, _, _ in results]
+    assert names == ["Dahl de lentilles", "Curry de légumes"]
+    # Repeated dishes are collapsed into the best scoring occurrence
+    assert results[1][0].id == "4"
+    assert results[0][2] == ["curry", "pois chiche"]
+
+def test_similar_excludes_ingredients():
+    index = SimilarityIndex(make_meals())
+    reference = index.find(meal_id="1")
+
+    results = index.similar(reference, exclude_ingredients=["Pois chiche"])
+
+    assert [meal.id for meal, _, _ in results] == ["4"]
+
+def test_incremental_update_through_history():
+    history = MealHistory()
+    history.load(make_meals())
+    index = history.derived("similarity", SimilarityIndex)
+
+    history.apply_update(Meal(id="5", name="Croque-monsieur", date="2026-02-02", ingredients=["pain", "curry"], heure="Soir"))
+
+    assert history.derived("similarity", SimilarityIndex) is index
+    reference = index.find(meal_id="1")
+    assert "5" in [meal.id for meal, _, _ in index.similar(reference)]
+
+def test_find_prefers_the_latest_meal_across_timezones():
+    # 20:00 in New York is later than 22:00 in London on the same day
+    index = SimilarityIndex([
+        Meal(id="1", name="Wok", date="2026-02-14T22:00:00+00:00", heure="Soir"),
+        Meal(id="2", name="Wok", date="2026-02-14T20:00:00-05:00", heure="Soir"),
+    ])
+
+    assert index.find(name="wok").id == "2"
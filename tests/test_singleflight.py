@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from meals_mcp.utils.notion import NotionClient
+from meals_mcp.utils.singleflight import SingleFlight
+
+def test_concurrent_calls_are_coalesced():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def slow_read():
+        executions.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["meal"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", slow_read)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", slow_read))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    # Wait for the followers to join the in-flight call before releasing it
+    while flight.calls < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(timeout=5)
+
+    assert len(executions) == 1
+    assert results == [["meal"]] * 4
+    assert flight.stats() == {"calls": 4, "executions": 1, "coalesced": 3, "coalescing_rate": 0.75}
+
+def test_sequential_calls_and_errors_are_not_shared():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("key", MagicMock(side_effect=ValueError("boom")))
+    assert flight.do("key", lambda: 42) == 42
+    assert flight.coalesced == 0
+
+@patch("meals_mcp.utils.notion.notion_client.Client")
+def test_data_source_id_is_discovered_once(MockNotionAPIClient):
+    api = MockNotionAPIClient.return_value
+    api.search.return_value = {"results": [{"object": "data_source", "id": "ds-1"}]}
+    api.data_sources.query.return_value = {"results": []}
+    client = NotionClient(auth_token="test_token")
+
+    client.get_meals()
+    client.get_meals(search_query="pâtes")
+
+    api.search.assert_called_once()
+    assert api.data_sources.query.call_count == 2
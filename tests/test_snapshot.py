@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import patch
+from meals_mcp.main import cli
+from meals_mcp.models import Meal
+from meals_mcp.utils.snapshot import MealSnapshot, SnapshotClient, write_snapshot
+
+MEALS = [
+    Meal(id="3", name="Lasagnes à la bolognaise", date="2026-02-21", ingredients=["pâtes", "viande hachée", "tomate"], heure="Soir"),
+    Meal(id="2", name="Pâtes au thon", date="2026-02-17T19:30:00.000+01:00", ingredients=["pâtes", "thon", "tomate"], heure="Soir", recipe="http://recipe.com"),
+    Meal(id="1", name="Omelette", date="2026-02-14", ingredients=[], heure="Midi", source="home"),
+]
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "meals.snapshot")
+    write_snapshot(MEALS, path)
+
+    snapshot = MealSnapshot(path)
+    assert len(snapshot) == 3
+    assert list(snapshot) == MEALS
+    assert list(snapshot.ordinals) == [739668, 739664, 739661]
+    # Ingredient tags are interned once
+    assert len(snapshot.ingredients) == 4
+    snapshot.close()
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snapshot")
+    write_snapshot([], path)
+    assert list(MealSnapshot(path)) == []
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / "meals.json"
+    path.write_bytes(b"{}" * 40)
+    with pytest.raises(ValueError):
+        MealSnapshot(str(path))
+
+def test_snapshot_client(tmp_path):
+    path = str(tmp_path / "meals.snapshot")
+    write_snapshot(MEALS, path)
+    client = SnapshotClient(path)
+
+    assert [meal.id for meal in client.get_meals(limit=2)] == ["3", "2"]
+    assert [meal.id for meal in client.get_meals(start_date="2026-02-15", end_date="2026-02-17")] == ["2"]
+    assert [meal.id for meal in client.get_meals(search_query="pates")] == ["2"]
+    with pytest.raises(PermissionError):
+        client.update_meal("1", {"name": "Omelette aux herbes"})
+
+@patch("meals_mcp.main.NotionClient")
+def test_cli_snapshot(MockNotionClient, tmp_path, capsys):
+    MockNotionClient.return_value.get_all_meals.return_value = MEALS
+    path = str(tmp_path / "meals.snapshot")
+
+    cli(["snapshot", path])
+    cli(["snapshot", "--info", path])
+
+    captured = capsys.readouterr()
+    assert "Saved 3 meals to" in captured.out
+    assert f"Snapshot {path}: 3 meals" in captured.out
+    assert "- Dates: 2026-02-14 to 2026-02-21" in captured.out
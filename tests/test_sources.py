@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock
+from meals_mcp.models import Meal
+from meals_mcp.utils.sources import MultiSourceClient, parse_sources
+
+def make_client(*dates):
+    client = MagicMock()
+    meals = [Meal(id=f"{date}-{i}", name=f"Meal {date}", date=date, heure="Soir") for i, date in enumerate(dates)]
+    client.get_meals.side_effect = lambda limit=30, **kwargs: meals[:limit]
+    client.get_all_meals.return_value = meals
+    return client
+
+def test_parse_sources():
+    assert parse_sources("home=TOKEN_HOME, work=TOKEN_WORK") == {"home": "TOKEN_HOME", "work": "TOKEN_WORK"}
+    with pytest.raises(ValueError):
+        parse_sources("home")
+    with pytest.raises(ValueError):
+        parse_sources("")
+
+def test_merge_is_date_sorted_tagged_and_limited():
+    home = make_client("2026-02-21", "2026-02-15", "2026-02-10")
+    work = make_client("2026-02-20", "2026-02-18T12:00:00.000+01:00")
+    client = MultiSourceClient({"home": home, "work": work})
+
+    meals = client.get_meals(limit=3)
+
+    assert [(meal.date[:10], meal.source) for meal in meals] == [
+        ("2026-02-21", "home"),
+        ("2026-02-20", "work"),
+        ("2026-02-18", "work"),
+    ]
+    home.get_meals.assert_called_once_with(limit=3, start_date=None, end_date=None, search_query=None)
+    assert len(client.get_all_meals()) == 5
+
+def test_update_is_routed_to_the_meal_source():
+    home = make_client("2026-02-21")
+    work = make_client("2026-02-20")
+    work.update_meal.return_value = Meal(id="2026-02-20-0", name="Wok", date="2026-02-20", heure="Soir")
+    client = MultiSourceClient({"home": home, "work": work})
+    client.get_meals()
+
+    meal = client.update_meal("2026-02-20-0", {"name": "Wok"})
+
+    assert meal.source == "work"
+    home.update_meal.assert_not_called()
+
+def test_update_of_an_unknown_meal_tries_each_source():
+    home, work = MagicMock(), MagicMock()
+    home.update_meal.side_effect = RuntimeError("object_not_found")
+    work.update_meal.return_value = Meal(id="x", name="Wok", date="2026-02-20", heure="Soir")
+    client = MultiSourceClient({"home": home, "work": work})
+
+    assert client.update_meal("x", {"name": "Wok"}).source == "work"
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("TOKEN_HOME", "secret")
+    client_class = MagicMock()
+
+    client = MultiSourceClient.from_env(client_class, "home=TOKEN_HOME")
+
+    client_class.assert_called_once_with(auth_token="secret")
+    assert list(client.clients) == ["home"]
+    with pytest.raises(ValueError):
+        MultiSourceClient.from_env(client_class, "work=TOKEN_MISSING")
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+from meals_mcp.utils.startup import import_times, time_to_initialize
+
+# Generous upper bound on a cold start, to catch heavy imports creeping back in
+INITIALIZE_BUDGET_SECONDS = 10
+
+def test_heavy_imports_are_deferred():
+    script = (
+        "import sys, meals_mcp.server, meals_mcp.agents.core; "
+        "print('notion_client' in sys.modules, 'google.genai' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
+
+def test_import_times():
+    modules = [name for name, _, _ in import_times()]
+    assert "meals_mcp.server" in modules
+    assert "meals_mcp.utils.stats" not in modules
+    assert "meals_mcp.utils.search" not in modules
+
+def test_time_to_initialize():
+    assert time_to_initialize() < INITIALIZE_BUDGET_SECONDS
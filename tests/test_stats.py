@@ -0,0 +1,39 @@
+import pytest
+from meals_mcp.models import Meal
+from meals_mcp.utils.stats import MealStats, period_key
+
+@pytest.fixture
+def stats():
+    return MealStats([
+        Meal(name="Lasagnes", date="2026-02-21", ingredients=["pâtes", "tomate", "béchamel"], heure="Soir"),
+        Meal(name="Wok", date="2026-01-14", ingredients=["poulet", "légumes"], heure="Soir"),
+        Meal(name="Pâtes au thon", date="2026-02-17T19:30:00.000+01:00", ingredients=["Pâtes", "thon", "tomate"], heure="Soir"),
+        Meal(name="Fajitas", date="2025-12-20", ingredients=["poulet", "poivron", "oignon"], heure="Soir"),
+    ])
+
+def test_counts_are_case_insensitive(stats):
+    assert stats.total() == 4
+    assert stats.count("PÂTES") == 2
+    assert stats.count("unknown") == 0
+
+def test_date_range(stats):
+    assert stats.total(start_date="2026-01-01") == 3
+    assert stats.count("poulet", start_date="2026-01-01") == 1
+    assert stats.count("pâtes", end_date="2026-02-17") == 1
+    assert stats.last_seen("poulet") == "2026-01-14"
+    assert stats.last_seen("poulet", end_date="2026-01-01") == "2025-12-20"
+
+def test_top_ingredients(stats):
+    top = stats.top_ingredients(2)
+    assert top == [("poulet", 2, "2026-01-14"), ("pâtes", 2, "2026-02-21")]
+
+def test_frequency_and_cooccurrence(stats):
+    assert stats.frequency("poulet", "month") == [("2025-12", 1), ("2026-01", 1)]
+    assert stats.frequency("tomate", "quarter") == [("2026-Q1", 2)]
+    assert stats.cooccurrence("tomate", 1) == [("pâtes", 2)]
+
+def test_period_key():
+    assert period_key("2026-02-21", "week") == "2026-W08"
+    assert period_key("2026-02-21", "year") == "2026"
+    with pytest.raises(ValueError):
+        period_key("2026-02-21", "day")
@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from meals_mcp.models import Meal
+from meals_mcp.utils.history import MealHistory
+from meals_mcp.utils.writebehind import WriteBehindQueue
+
+def make_history():
+    history = MealHistory()
+    history.load([
+        Meal(id="1", name="Omelette", date="2026-02-14", ingredients=["oeufs"], heure="Midi"),
+        Meal(id="2", name="Wok", date="2026-02-15", ingredients=["poulet"], heure="Soir"),
+    ])
+    return history
+
+def test_submit_is_visible_locally_and_merged_on_flush(tmp_path):
+    client = MagicMock()
+    history = make_history()
+    queue = WriteBehindQueue(client, str(tmp_path / "journal.jsonl"), history=history)
+
+    meal = queue.submit("1", {"name": "Omelette aux herbes"})
+    queue.submit("1", {"heure": "Soir"})
+    queue.submit("2", {"ingredients": ["poulet", "poivron"]})
+
+    assert meal.name == "Omelette aux herbes"
+    assert history.meals[0].heure == "Soir"
+    assert queue.status()["pending"] == 3
+    client.update_meal.assert_not_called()
+
+    assert queue.flush() == 2
+    client.update_meal.assert_any_call(meal_id="1", updates={"name": "Omelette aux herbes", "heure": "Soir"})
+    client.update_meal.assert_any_call(meal_id="2", updates={"ingredients": ["poulet", "poivron"]})
+    assert queue.status() == {"pending": 0, "pending_pages": 0, "failed": []}
+    assert (tmp_path / "journal.jsonl").read_text() == ""
+
+def test_pending_updates_survive_restart(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    WriteBehindQueue(MagicMock(), journal).submit("1", {"name": "Omelette aux herbes"})
+
+    client = MagicMock()
+    history = MealHistory()
+    queue = WriteBehindQueue(client, journal, history=history)
+    # Reloaded history still shows the local edit until it reaches Notion
+    history.load([Meal(id="1", name="Omelette", date="2026-02-14", heure="Midi")])
+    assert history.meals[0].name == "Omelette aux herbes"
+
+    queue.flush()
+    client.update_meal.assert_called_once_with(meal_id="1", updates={"name": "Omelette aux herbes"})
+
+def test_failed_writes_are_retried_then_reported(tmp_path):
+    client = MagicMock()
+    client.update_meal.side_effect = RuntimeError("rate limited")
+    history = make_history()
+    queue = WriteBehindQueue(client, str(tmp_path / "journal.jsonl"), history=history, max_attempts=2)
+    queue.submit("1", {"name": "Omelette aux herbes"})
+
+    queue.flush()
+    assert queue.status()["pending"] == 1
+    # Backing off: not retried before the delay unless forced
+    queue.flush()
+    assert client.update_meal.call_count == 1
+    queue.flush(force=True)
+
+    status = queue.status()
+    assert status["pending"] == 0
+    assert status["failed"] == [{"meal_id": "1", "updates": {"name": "Omelette aux herbes"}, "error": "rate limited"}]
+    assert history.is_stale
+
+    # Failures are kept across restarts
+    assert WriteBehindQueue(client, str(tmp_path / "journal.jsonl")).status()["failed"] == status["failed"]
+
+def test_journal_is_compacted_after_every_flush(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    client = MagicMock()
+    queue = WriteBehindQueue(client, str(journal))
+
+    queue.submit("1", {"name": "Omelette aux herbes"})
+    queue.flush()
+    queue.submit("2", {"name": "Wok"})
+    client.update_meal.side_effect = RuntimeError("rate limited")
+    queue.flush()
+    client.update_meal.side_effect = None
+    queue.submit("1", {"heure": "Soir"})
+    queue.flush()
+
+    # Only the write still pending is left in the journal
+    assert len(journal.read_text().splitlines()) == 1
+    assert WriteBehindQueue(MagicMock(), str(journal)).status()["pending"] == 1
+
+def test_failed_writes_are_cleared(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    client = MagicMock()
+    client.update_meal.side_effect = RuntimeError("rate limited")
+    queue = WriteBehindQueue(client, journal, max_attempts=1)
+    queue.submit("1", {"name": "Omelette aux herbes"})
+    queue.submit("2", {"name": "Wok"})
+    queue.flush()
+    assert len(queue.status()["failed"]) == 2
+
+    # A later write to other fields of the page leaves its failure listed
+    client.update_meal.side_effect = None
+    queue.submit("1", {"heure": "Soir"})
+    queue.flush()
+    client.update_meal.assert_called_with(meal_id="1", updates={"heure": "Soir"})
+    assert [failure["meal_id"] for failure in queue.status()["failed"]] == ["1", "2"]
+    assert len(WriteBehindQueue(client, journal).status()["failed"]) == 2
+
+    # One writing the same fields again supersedes it
+    queue.submit("1", {"name": "Omelette"})
+    queue.flush()
+    assert [failure["meal_id"] for failure in queue.status()["failed"]] == ["2"]
+
+    assert queue.discard_failed("2") == 1
+    assert queue.status()["failed"] == []
+    assert WriteBehindQueue(client, journal).status() == {"pending": 0, "pending_pages": 0, "failed": []}
+
+@pytest.mark.asyncio
+async def test_run_flushes_in_background(tmp_path):
+    client = MagicMock()
+    queue = WriteBehindQueue(client, str(tmp_path / "journal.jsonl"), flush_interval=0.01)
+    queue.submit("1", {"name": "Omelette aux herbes"})
+
+    task = asyncio.create_task(queue.run())
+    await asyncio.sleep(0.1)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    client.update_meal.assert_called_once()